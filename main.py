@@ -236,10 +236,11 @@ class BotThread(threading.Thread):
         self.market       = market
         self.strategy_key = strategy_key
         self.run_kwargs   = run_kwargs
+        self.module       = None
 
     def run(self):
         try:
-            module = load_bot_module(self.strategy_key, self.market)
+            module = self.module = load_bot_module(self.strategy_key, self.market)
             log.info(f"[{self.market.upper()}] Module loaded OK.")
         except Exception as exc:
             log.error(f"[{self.market.upper()}] Failed to load module: {exc}")
@@ -399,6 +400,11 @@ def main():
 
     # ── Graceful shutdown ──────────────────────────────────────────────────────
     log.info("Waiting for all threads to stop ...")
+    for t in threads:
+        # Bots exposing stop() cut their current wait short instead of sleeping it out
+        stop = getattr(t.module, "stop", None)
+        if stop is not None:
+            stop()
     for t in threads:
         t.join(timeout=15)
         if t.is_alive():
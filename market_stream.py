@@ -1,7 +1,8 @@
 """
 market_stream.py
 ----------------
-WebSocket price feed for Polymarket CLOB market channel.
+WebSocket price feed for Polymarket CLOB market channel, plus an
+authenticated USER channel stream for order fill / cancel notifications.
 
 Replaces the REST polling loop (fetch_midpoint every N seconds) with a
 persistent WSS connection that receives pushed updates in real time.
@@ -43,6 +44,7 @@ except ImportError:
 log = logging.getLogger("MarketStream")
 
 WSS_MARKET_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+WSS_USER_URL   = "wss://ws-subscriptions-clob.polymarket.com/ws/user"
 PING_INTERVAL   = 20   # seconds between keep-alive pings
 RECONNECT_DELAY = 3    # seconds before reconnect attempt
 MAX_RECONNECT   = 10   # max consecutive reconnect attempts before giving up
@@ -57,7 +59,7 @@ class TokenPrice:
         self.best_ask   : Optional[float] = None
         self.last_trade : Optional[float] = None
         self.tick_size  : float           = 0.01
-        self.timestamp  : int             = 0
+        self.timestamp  : float           = 0.0   # monotonic time of last update
 
     @property
     def midpoint(self) -> Optional[float]:
@@ -68,15 +70,24 @@ class TokenPrice:
         Falls back gracefully if data is incomplete.
         """
         with self._lock:
-            if self.best_bid is not None and self.best_ask is not None:
-                spread = self.best_ask - self.best_bid
-                if spread <= 0.02:
-                    return round((self.best_bid + self.best_ask) / 2, 4)
-            if self.last_trade is not None:
-                return self.last_trade
-            if self.best_bid is not None and self.best_ask is not None:
+            return self._midpoint()
+
+    def _midpoint(self) -> Optional[float]:
+        # Caller holds _lock
+        if self.best_bid is not None and self.best_ask is not None:
+            spread = self.best_ask - self.best_bid
+            if spread <= 0.02:
                 return round((self.best_bid + self.best_ask) / 2, 4)
-            return None
+        if self.last_trade is not None:
+            return self.last_trade
+        if self.best_bid is not None and self.best_ask is not None:
+            return round((self.best_bid + self.best_ask) / 2, 4)
+        return None
+
+    def snapshot(self) -> tuple:
+        """(midpoint, tick_size, timestamp) under a single lock acquisition."""
+        with self._lock:
+            return self._midpoint(), self.tick_size, self.timestamp
 
     def update_from_price_change(self, change: dict):
         with self._lock:
@@ -122,22 +133,30 @@ class MarketStream:
         stream.stop()
 
     Callbacks (optional):
-        on_price_update(token_id, midpoint)  — called on every price change
+        on_price_update(token_id, midpoint)       — called on every price change
+        on_tick_size_change(token_id, tick_size)  — called when the tick size changes
+
+    Polling loops can pace themselves with wait_for_tick(POLL_INTERVAL): it
+    returns as soon as any subscribed price moves, or after the timeout.
     """
 
     def __init__(
         self,
         asset_ids: list[str],
         on_price_update: Optional[Callable[[str, float], None]] = None,
+        on_tick_size_change: Optional[Callable[[str, float], None]] = None,
     ):
         self.asset_ids      = asset_ids
         self.on_price_update = on_price_update
+        self.on_tick_size_change = on_tick_size_change
 
         self._prices: Dict[str, TokenPrice] = {aid: TokenPrice() for aid in asset_ids}
         self._ws             : Optional[websocket.WebSocketApp] = None
         self._thread         : Optional[threading.Thread] = None
         self._ready          = threading.Event()    # set when first book received
         self._stop_flag      = threading.Event()
+        self._tick_event     = threading.Event()    # set on every price update
+        self._last_wake      = 0.0                  # monotonic time of last wait_for_tick return
         self._reconnects     = 0
         self._connected      = False
 
@@ -162,12 +181,51 @@ class MarketStream:
         """
         return self._ready.wait(timeout=timeout)
 
+    def wake(self):
+        """Release a pending wait_for_tick() without a price update."""
+        self._tick_event.set()
+
+    def wait_for_tick(self, timeout: float, min_gap: float = 0.0) -> bool:
+        """
+        Block until the next price update for any subscribed token, or timeout.
+        Returns True if woken by an update, False if the timeout elapsed.
+
+        min_gap coalesces bursts: an update-driven wake never returns sooner
+        than min_gap after the previous one, so a flurry of messages collapses
+        into a single wake that reads only the latest prices.
+        """
+        fired = self._tick_event.wait(timeout=timeout)
+        if fired and min_gap:
+            gap = self._last_wake + min_gap - time.monotonic()
+            if gap > 0:
+                time.sleep(gap)
+        self._tick_event.clear()
+        self._last_wake = time.monotonic()
+        return fired
+
     def get_midpoint(self, token_id: str) -> Optional[float]:
         return self._prices[token_id].midpoint if token_id in self._prices else None
 
     def get_tick_size(self, token_id: str) -> float:
         return self._prices[token_id].tick_size if token_id in self._prices else 0.01
 
+    def snapshot(self, token_ids) -> Dict[str, tuple]:
+        """
+        {token_id: (midpoint, tick_size, age_secs)} for each token, read with
+        one lock acquisition per token instead of one per getter. Tokens with
+        no data yet report (None, 0.01, inf).
+        """
+        now  = time.monotonic()
+        snap = {}
+        for tid in token_ids:
+            tp = self._prices.get(tid)
+            if tp is None:
+                snap[tid] = (None, 0.01, float("inf"))
+                continue
+            mid, tick, ts = tp.snapshot()
+            snap[tid] = (mid, tick, now - ts if ts else float("inf"))
+        return snap
+
     def get_prices(self) -> Dict[str, Optional[float]]:
         return {tid: tp.midpoint for tid, tp in self._prices.items()}
 
@@ -282,7 +340,12 @@ class MarketStream:
                     self._prices[asset_id].update_tick_size(new_tick)
                     log.info(f"[WS] Tick size changed for {asset_id[:16]}... → {new_tick}")
                 except (KeyError, ValueError):
-                    pass
+                    return
+                if self.on_tick_size_change:
+                    try:
+                        self.on_tick_size_change(asset_id, new_tick)
+                    except Exception as exc:
+                        log.debug(f"[WS] on_tick_size_change callback error: {exc}")
 
         # best_bid_ask (behind custom_feature_enabled flag — handle if present)
         elif etype == "best_bid_ask":
@@ -298,6 +361,8 @@ class MarketStream:
                 self._notify(asset_id)
 
     def _notify(self, asset_id: str):
+        self._prices[asset_id].timestamp = time.monotonic()
+        self._tick_event.set()
         if self.on_price_update:
             mid = self._prices[asset_id].midpoint
             if mid is not None:
@@ -312,4 +377,203 @@ class MarketStream:
 
     def _on_close(self, ws, code, reason):
         log.info(f"[WS] Closed (code={code} reason={reason})")
-        self._connected = False
\ No newline at end of file
+        self._connected = False
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  USER CHANNEL
+# ══════════════════════════════════════════════════════════════════════════════
+
+class UserStream:
+    """
+    Authenticated WebSocket connection to the Polymarket USER channel.
+
+    Pushes order lifecycle events for the API key's own orders, so bots can
+    learn that a resting TP/SL bracket filled or was cancelled without
+    polling GET /order for every open order.
+
+    WSS endpoint: wss://ws-subscriptions-clob.polymarket.com/ws/user
+    Auth: L2 API creds (api_key / api_secret / api_passphrase).
+
+    Message types handled:
+      order — PLACEMENT / UPDATE / CANCELLATION; an order is closed once it
+              is cancelled or size_matched reaches original_size, and
+              matched_size() reports partial fills before that
+      trade — MATCHED / MINED / CONFIRMED; logged at debug level only
+
+    Usage:
+        stream = UserStream(client.creds, markets=[condition_id])
+        stream.start()
+        stream.wait_ready(timeout=10)
+        if stream.is_closed(order_id): ...
+        stream.stop()
+
+    Callback (optional):
+        on_order_closed(order_id, status)  — called once an order is FILLED / CANCELLED
+
+    `generation` increments on every (re)connect. Events sent while the
+    socket was down are not replayed, so callers should re-check order
+    status over REST once whenever the generation changes.
+    """
+
+    def __init__(
+        self,
+        creds,
+        markets: Optional[list[str]] = None,
+        on_order_closed: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.creds           = creds
+        self.markets         = [m for m in (markets or []) if m]
+        self.on_order_closed = on_order_closed
+
+        self._lock       = threading.Lock()
+        self._closed     : Dict[str, str] = {}       # order_id → final status
+        self._matched    : Dict[str, float] = {}     # order_id → size_matched so far
+        self._ws         : Optional[websocket.WebSocketApp] = None
+        self._thread     : Optional[threading.Thread] = None
+        self._ready      = threading.Event()
+        self._stop_flag  = threading.Event()
+        self._reconnects = 0
+        self._connected  = False
+        self.generation  = 0
+
+    # ── Public API ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start the WSS connection in a background thread."""
+        self._stop_flag.clear()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name="UserStream")
+        self._thread.start()
+
+    def stop(self):
+        """Disconnect and stop the background thread."""
+        self._stop_flag.set()
+        if self._ws:
+            self._ws.close()
+
+    def wait_ready(self, timeout: float = 15.0) -> bool:
+        """Block until the subscription has been sent. Returns False on timeout."""
+        return self._ready.wait(timeout=timeout)
+
+    def is_closed(self, order_id: str) -> bool:
+        """True once the order has been fully filled or cancelled."""
+        with self._lock:
+            return order_id in self._closed
+
+    def matched_size(self, order_id: str) -> float:
+        """Shares matched so far on the order (0.0 if none seen)."""
+        with self._lock:
+            return self._matched.get(order_id, 0.0)
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    # ── Internal ───────────────────────────────────────────────────────────────
+
+    def _run_loop(self):
+        """Reconnect loop — runs until stop() is called."""
+        while not self._stop_flag.is_set():
+            try:
+                self._connect()
+            except Exception as exc:
+                log.error(f"[WS-user] Connection error: {exc}")
+
+            if self._stop_flag.is_set():
+                break
+
+            self._reconnects += 1
+            if self._reconnects > MAX_RECONNECT:
+                log.error(f"[WS-user] Max reconnect attempts ({MAX_RECONNECT}) reached.")
+                break
+
+            delay = min(RECONNECT_DELAY * self._reconnects, 30)
+            log.info(f"[WS-user] Reconnecting in {delay}s (attempt {self._reconnects}) ...")
+            self._stop_flag.wait(timeout=delay)
+
+    def _connect(self):
+        self._connected = False
+        log.info(f"[WS-user] Connecting to {WSS_USER_URL} ...")
+
+        self._ws = websocket.WebSocketApp(
+            WSS_USER_URL,
+            on_open    = self._on_open,
+            on_message = self._on_message,
+            on_error   = self._on_error,
+            on_close   = self._on_close,
+        )
+        self._ws.run_forever(ping_interval=PING_INTERVAL, ping_timeout=10)
+
+    def _on_open(self, ws):
+        log.info("[WS-user] Connected — subscribing to user channel ...")
+        sub = {
+            "auth": {
+                "apiKey"    : self.creds.api_key,
+                "secret"    : self.creds.api_secret,
+                "passphrase": self.creds.api_passphrase,
+            },
+            "markets": self.markets,
+            "type"   : "user",
+        }
+        ws.send(json.dumps(sub))
+        self._connected  = True
+        self._reconnects = 0
+        self.generation += 1
+        self._ready.set()
+
+    def _on_message(self, ws, raw: str):
+        try:
+            data   = json.loads(raw)
+            events = data if isinstance(data, list) else [data]
+            for event in events:
+                self._dispatch(event)
+        except Exception as exc:
+            log.debug(f"[WS-user] Message parse error: {exc} | raw={raw[:200]}")
+
+    def _dispatch(self, event: dict):
+        etype = event.get("event_type")
+
+        if etype == "order":
+            order_id = event.get("id")
+            if not order_id:
+                return
+            otype = (event.get("type") or "").upper()
+            if otype == "CANCELLATION":
+                self._mark_closed(order_id, "CANCELLED")
+            elif otype == "UPDATE":
+                try:
+                    matched  = float(event.get("size_matched") or 0)
+                    original = float(event.get("original_size") or 0)
+                except (TypeError, ValueError):
+                    return
+                if matched > 0:
+                    with self._lock:
+                        self._matched[order_id] = matched
+                if original > 0 and matched >= original:
+                    self._mark_closed(order_id, "FILLED")
+
+        elif etype == "trade" and log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                f"[WS-user] Trade {event.get('status')} "
+                f"taker={str(event.get('taker_order_id', ''))[:16]}..."
+            )
+
+    def _mark_closed(self, order_id: str, status: str):
+        with self._lock:
+            if order_id in self._closed:
+                return
+            self._closed[order_id] = status
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"[WS-user] Order {order_id[:16]}... {status}")
+        if self.on_order_closed:
+            try:
+                self.on_order_closed(order_id, status)
+            except Exception as exc:
+                log.debug(f"[WS-user] on_order_closed callback error: {exc}")
+
+    def _on_error(self, ws, error):
+        log.warning(f"[WS-user] Error: {error}")
+        self._connected = False
+
+    def _on_close(self, ws, code, reason):
+        log.info(f"[WS-user] Closed (code={code} reason={reason})")
+        self._connected = False
@@ -23,36 +23,54 @@ Decimal constraints enforced automatically:
 """
 
 import os
+import math
 import threading
+from dataclasses import dataclass
 from decimal import Decimal, ROUND_DOWN
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Set
 
 from py_clob_client.clob_types import OrderArgs, MarketOrderArgs, OrderType
+from py_clob_client.exceptions import PolyApiException
 from py_clob_client.order_builder.constants import BUY, SELL
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-#  DECIMAL HELPERS
+#  PRICE / SIZE HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Prices and share sizes live on a 1e-4 grid and USDC amounts on a 1e-2
+# grid, so the helpers below work in integer units: price4 * size4 is the
+# notional in 1e-8 USDC, and "max 2dp" is divisibility by 1e6.
+_P4      = 10_000
+_CENT_P8 = 1_000_000
+
+
+def _to_ticks(price: float, tick_size=0.01) -> int:
+    """Whole ticks at or below price (IEEE noise absorbed before flooring)."""
+    return math.floor(round(price / tick_size, 6))
+
+
+def _from_ticks(n: int, tick_size=0.01) -> float:
+    return round(n * tick_size, 4)
+
+
+def _buy_params(price_f: float, usdc_size: float) -> Tuple[float, float]:
+    """Largest size ≤ usdc_size / price_f (4dp) whose notional has max 2dp."""
+    p4     = round(price_f * _P4)
+    budget = math.floor(round(usdc_size * 100, 6))   # whole cents
+    for cents in range(budget, max(0, budget - 200), -1):
+        size4 = cents * _CENT_P8 // p4
+        if size4 > 0 and p4 * size4 // _CENT_P8 == cents:
+            return price_f, size4 / _P4
+    return price_f, max(_CENT_P8 // p4, 1) / _P4
+
+
 def _safe_order_params(price: float, usdc_size: float, tick_size=0.01) -> Tuple[float, float]:
     """
     Return (price_f, size_f) for FAK/FOK BUY.
     Snaps price DOWN to nearest tick. price * size has max 2dp, size max 4dp.
     """
-    tick_d       = Decimal(str(float(tick_size)))
-    price_d      = Decimal(str(price)).quantize(tick_d, rounding=ROUND_DOWN)
-    price_d      = max(Decimal("0.01"), min(price_d, Decimal("0.99")))
-    budget_cents = int(Decimal(str(usdc_size)).quantize(Decimal("0.01"), rounding=ROUND_DOWN) * 100)
-
-    for cents in range(budget_cents, max(0, budget_cents - 200), -1):
-        maker_d = Decimal(cents) / Decimal("100")
-        size_d  = (maker_d / price_d).quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-        if size_d > 0 and (price_d * size_d).quantize(Decimal("0.01"), rounding=ROUND_DOWN) == maker_d:
-            return float(price_d), float(size_d)
-
-    size_d = (Decimal("0.01") / price_d).quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-    return float(price_d), float(max(size_d, Decimal("0.0001")))
+    return _buy_params(_snap_price(price, tick_size), usdc_size)
 
 
 def _gtc_order_params(price: float, usdc_size: float, tick_size=0.01) -> Tuple[float, float]:
@@ -60,26 +78,17 @@ def _gtc_order_params(price: float, usdc_size: float, tick_size=0.01) -> Tuple[f
     Return (price_f, size_f) for GTC BUY.
     Snaps to nearest tick WITHOUT slippage — exact entry price preserved.
     """
-    tick_d       = Decimal(str(float(tick_size)))
-    price_d      = (Decimal(str(price)) / tick_d).to_integral_value(rounding=ROUND_DOWN) * tick_d
-    price_d      = max(Decimal("0.01"), min(price_d, Decimal("0.99")))
-    budget_cents = int(Decimal(str(usdc_size)).quantize(Decimal("0.01"), rounding=ROUND_DOWN) * 100)
+    return _buy_params(_snap_price(price, tick_size), usdc_size)
 
-    for cents in range(budget_cents, max(0, budget_cents - 200), -1):
-        maker_d = Decimal(cents) / Decimal("100")
-        size_d  = (maker_d / price_d).quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-        if size_d > 0 and (price_d * size_d).quantize(Decimal("0.01"), rounding=ROUND_DOWN) == maker_d:
-            return float(price_d), float(size_d)
 
-    size_d = (Decimal("0.01") / price_d).quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-    return float(price_d), float(max(size_d, Decimal("0.0001")))
+def _in_transit(exc: Exception) -> bool:
+    """True if a POST failed before any HTTP status came back (outcome unknown)."""
+    return isinstance(exc, PolyApiException) and exc.status_code is None
 
 
 def _snap_price(price: float, tick_size=0.01) -> float:
     """Snap price to tick size and clamp to [0.01, 0.99]."""
-    tick_d  = Decimal(str(float(tick_size)))
-    price_d = (Decimal(str(price)) / tick_d).to_integral_value(rounding=ROUND_DOWN) * tick_d
-    return float(max(Decimal("0.01"), min(price_d, Decimal("0.99"))))
+    return min(0.99, max(0.01, _from_ticks(_to_ticks(price, tick_size), tick_size)))
 
 
 def _sell_params(price: float, total_shares: float, tick_size=0.01) -> Tuple[float, float]:
@@ -87,15 +96,86 @@ def _sell_params(price: float, total_shares: float, tick_size=0.01) -> Tuple[flo
     Return (price_f, size_f) for a SELL limit order (GTC/FOK).
     Snaps price to tick, adjusts shares so that price * shares has max 2dp.
     """
-    price_f  = _snap_price(price, tick_size)
-    price_d  = Decimal(str(price_f))
-    shares_d = Decimal(str(total_shares)).quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
+    price_f = _snap_price(price, tick_size)
+    p4      = round(price_f * _P4)
+    s4      = math.floor(round(total_shares * _P4, 6))
     for _ in range(200):
-        taker = price_d * shares_d
-        if taker == taker.quantize(Decimal("0.01"), rounding=ROUND_DOWN):
+        if p4 * s4 % _CENT_P8 == 0:
             break
-        shares_d -= Decimal("0.0001")
-    return price_f, float(max(shares_d, Decimal("0.0001")))
+        s4 -= 1
+    return price_f, max(s4, 1) / _P4
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  CLOB TRANSPORT
+# ══════════════════════════════════════════════════════════════════════════════
+
+_transport_lock  = threading.Lock()
+_transport_tuned = False
+
+
+def tune_clob_transport():
+    """
+    py-clob-client sends every call (orders, cancels, order status) through
+    one module-level httpx.Client. Its default 5s keep-alive expiry means a
+    bot idling between entries pays a fresh TLS handshake on the BUY that
+    matters — swap in a client that keeps idle connections for 60s.
+
+    Relies on the private py_clob_client.http_helpers.helpers._http_client
+    of the httpx-based SDK releases; a no-op on versions without it. Safe to
+    call from every bot — the client is only replaced once per process.
+    """
+    global _transport_tuned
+    with _transport_lock:
+        if _transport_tuned:
+            return
+        _transport_tuned = True
+        try:
+            import httpx
+            from py_clob_client.http_helpers import helpers as clob_http
+        except ImportError:
+            return
+        if not isinstance(getattr(clob_http, "_http_client", None), httpx.Client):
+            return
+        limits = httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0)
+        try:
+            clob_http._http_client = httpx.Client(http2=True, limits=limits)
+        except ImportError:  # h2 not installed → HTTP/1.1 keep-alive
+            clob_http._http_client = httpx.Client(limits=limits)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+#  ORDER RESULT
+# ══════════════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class OrderResult:
+    """
+    Typed, slotted view of a CLOB order response.
+
+    filled_shares / usdc_paid are takingAmount / makingAmount as echoed by
+    the CLOB — 0.0 when the response omits them (common with FAK orders).
+    """
+    __slots__ = ("success", "filled_shares", "usdc_paid", "raw")
+
+    success:       bool
+    filled_shares: float
+    usdc_paid:     float
+    raw:           dict
+
+    @classmethod
+    def from_response(cls, resp) -> Optional["OrderResult"]:
+        """Wrap a place_* response dict; None stays None."""
+        if not isinstance(resp, dict):
+            return None
+
+        def _amount(key: str) -> float:
+            try:
+                return float(resp.get(key) or 0)
+            except (TypeError, ValueError):
+                return 0.0
+
+        return cls(bool(resp.get("success")), _amount("takingAmount"), _amount("makingAmount"), resp)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -111,13 +191,14 @@ class GtcTracker:
 
     def __init__(self, client):
         self.client  = client
-        self._timers: Dict[str, threading.Timer] = {}
+        self._live:   Set[str]                   = set()  # every tracked order id
+        self._timers: Dict[str, threading.Timer] = {}     # only orders with a timeout
 
     def schedule(self, order_id: str, timeout: Optional[int], log=None) -> None:
+        self._live.add(order_id)
         if timeout is None:
             msg = f"[GTC] Order {order_id} registered (no timeout — rests until filled or cancelled)"
             print(msg) if log is None else log.info(msg)
-            self._timers[order_id] = None  # track it for cancel_all
             return
 
         def _cancel():
@@ -131,6 +212,7 @@ class GtcTracker:
                 msg3 = f"[GTC] Cancel failed for {order_id}: {exc}"
                 print(msg3) if log is None else log.error(msg3)
             finally:
+                self._live.discard(order_id)
                 self._timers.pop(order_id, None)
 
         timer = threading.Timer(timeout, _cancel)
@@ -140,7 +222,7 @@ class GtcTracker:
         msg = f"[GTC] Auto-cancel scheduled in {timeout}s for order {order_id}"
         print(msg) if log is None else log.info(msg)
 
-    def cancel(self, order_id: str, log=None) -> None:
+    def _cancel_order(self, order_id: str, log=None) -> None:
         timer = self._timers.pop(order_id, None)
         if timer is not None:
             timer.cancel()
@@ -152,13 +234,44 @@ class GtcTracker:
             msg = f"[GTC] Cancel failed for {order_id}: {exc}"
             print(msg) if log is None else log.warning(msg)
 
+    def cancel(self, order_id: str, log=None) -> None:
+        self._live.discard(order_id)
+        self._cancel_order(order_id, log)
+
     def cancel_all(self, log=None) -> None:
-        for order_id in list(self._timers.keys()):
-            self.cancel(order_id, log)
+        """Cancel every tracked order (see cancel_many)."""
+        self.cancel_many(list(self._live), log)
+
+    def cancel_many(self, order_ids, log=None) -> None:
+        """
+        Cancel the given orders in one batch request (DELETE /orders).
+        Falls back to one cancel per order if the batch call fails.
+        """
+        ids = [oid for oid in order_ids if oid]
+        if not ids:
+            return
+        for order_id in ids:
+            self._live.discard(order_id)
+            timer = self._timers.pop(order_id, None)
+            if timer is not None:
+                timer.cancel()
+
+        if len(ids) > 1:
+            try:
+                self.client.cancel_orders(ids)
+                msg = f"[GTC] Cancelled {len(ids)} orders in one batch"
+                print(msg) if log is None else log.info(msg)
+                return
+            except Exception as exc:
+                msg = f"[GTC] Batch cancel failed ({exc}) — cancelling one by one"
+                print(msg) if log is None else log.warning(msg)
+
+        for order_id in ids:
+            self._cancel_order(order_id, log)
 
     @property
     def open_order_ids(self):
-        return list(self._timers.keys())
+        return list(self._live)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -205,10 +318,26 @@ class OrderExecutor:
     # Minimum shares required by Polymarket for GTC limit orders
     GTC_MIN_SHARES = 5.0
 
+    def _post_signed(self, signed, order_type):
+        """
+        POST a signed order, re-sending the SAME signed payload once if the
+        first attempt failed in transit. Orders are keyed by their signed hash
+        (the salt makes it unique), so a resend of an order that did land is
+        rejected as a duplicate instead of filling twice — re-signing would
+        mint a second order.
+        """
+        try:
+            return self.client.post_order(signed, order_type)
+        except PolyApiException as exc:
+            if not _in_transit(exc):
+                raise
+            self._warn(f"  POST failed in transit ({exc}) — re-sending the same signed order")
+            return self.client.post_order(signed, order_type)
+
     def _place_fok_order(self, token_id: str, price_f: float, size_f: float, side: str):
         args   = OrderArgs(token_id=token_id, price=price_f, size=size_f, side=side)
         signed = self.client.create_order(args)
-        return self.client.post_order(signed, OrderType.FOK)
+        return self._post_signed(signed, OrderType.FOK)
 
     def _place_fak_order(self, token_id: str, amount: float, side: str,
                          fallback_price: float, fallback_size: float):
@@ -216,7 +345,9 @@ class OrderExecutor:
         FAK via MarketOrderArgs(token_id, amount, side).
           BUY  → amount = USDC to spend
           SELL → amount = shares to sell
-        Falls back to FOK (limit order) if MarketOrderArgs fails.
+        Falls back to FOK (limit order) if MarketOrderArgs fails — except for
+        a BUY whose outcome is unknown (lost in transit twice), which a fresh
+        FOK could double-fill.
         Both attempts are wrapped — returns None instead of raising so the
         caller can handle a failed order without crashing the bot.
         """
@@ -227,8 +358,11 @@ class OrderExecutor:
                 side     = side,
             )
             signed = self.client.create_market_order(margs)
-            return self.client.post_order(signed, OrderType.FAK)
+            return self._post_signed(signed, OrderType.FAK)
         except Exception as fak_err:
+            if side == BUY and _in_transit(fak_err):
+                self._error(f"  FAK BUY outcome unknown ({fak_err}) — not re-signing; order skipped")
+                return None
             self._warn(f"  FAK MarketOrderArgs failed ({fak_err}) — falling back to FOK")
             try:
                 return self._place_fok_order(token_id, fallback_price, fallback_size, side)
@@ -245,7 +379,7 @@ class OrderExecutor:
             return None
         args   = OrderArgs(token_id=token_id, price=price_f, size=size_f, side=side)
         signed = self.client.create_order(args)
-        return self.client.post_order(signed, OrderType.GTC)
+        return self._post_signed(signed, OrderType.GTC)
 
     # ── BUY ────────────────────────────────────────────────────────────────────
 
@@ -337,36 +471,34 @@ class OrderExecutor:
             self._warn("place_sell_bracket: shares too small, skipping")
             return result
 
-        # ── TP order ───────────────────────────────────────────────────────
-        tp_pf, tp_sf = _sell_params(tp_price, total_shares, tick_size)
-        self._info(f"  SELL {tp_sf:.4f} shares @ {tp_pf:.4f}  [GTC TP]")
+        result["tp_order_id"] = self._place_bracket_leg(token_id, "TP", tp_price, total_shares, tick_size)
+        if sl_price is not None:
+            result["sl_order_id"] = self._place_bracket_leg(token_id, "SL", sl_price, total_shares, tick_size)
+
+        return result
+
+    def _place_bracket_leg(
+        self,
+        token_id:     str,
+        label:        str,
+        price:        float,
+        total_shares: float,
+        tick_size:    float,
+    ) -> Optional[str]:
+        """Place one GTC SELL leg (TP or SL) and register it; returns the order ID or None."""
+        pf, sf = _sell_params(price, total_shares, tick_size)
+        self._info(f"  SELL {sf:.4f} shares @ {pf:.4f}  [GTC {label}]")
         try:
-            resp = self._place_gtc_order(token_id, tp_pf, tp_sf, SELL)
+            resp = self._place_gtc_order(token_id, pf, sf, SELL)
             if resp and isinstance(resp, dict):
                 order_id = self._extract_order_id(resp)
                 if order_id:
                     self.gtc_tracker.schedule(order_id, self.gtc_timeout, self.log)
-                    result["tp_order_id"] = order_id
-                    self._info(f"  TP order placed | id={order_id} | price={tp_pf:.4f}")
+                    self._info(f"  {label} order placed | id={order_id} | price={pf:.4f}")
+                    return order_id
         except Exception as exc:
-            self._error(f"  TP order failed: {exc}")
-
-        # ── SL order ───────────────────────────────────────────────────────
-        if sl_price is not None:
-            sl_pf, sl_sf = _sell_params(sl_price, total_shares, tick_size)
-            self._info(f"  SELL {sl_sf:.4f} shares @ {sl_pf:.4f}  [GTC SL]")
-            try:
-                resp = self._place_gtc_order(token_id, sl_pf, sl_sf, SELL)
-                if resp and isinstance(resp, dict):
-                    order_id = self._extract_order_id(resp)
-                    if order_id:
-                        self.gtc_tracker.schedule(order_id, self.gtc_timeout, self.log)
-                        result["sl_order_id"] = order_id
-                        self._info(f"  SL order placed | id={order_id} | price={sl_pf:.4f}")
-            except Exception as exc:
-                self._error(f"  SL order failed: {exc}")
-
-        return result
+            self._error(f"  {label} order failed: {exc}")
+        return None
 
     # ── Emergency SELL (fallback if bracket orders both fail) ──────────────────
 
@@ -426,4 +558,4 @@ class OrderExecutor:
             "    2. Shares not yet settled on-chain — will retry next tick\n"
             "    3. Market closed or price out of valid range"
         )
-        return None
\ No newline at end of file
+        return None
@@ -10,9 +10,16 @@ Usage:
 """
 
 import os
+import re
 import sys
 import subprocess
+import stat
 import argparse
+import functools
+import tempfile
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ── Constants ─────────────────────────────────────────────────────────────────
@@ -23,30 +30,36 @@ CHAIN_ID  = 137
 
 ASSETS = ["btc", "eth", "sol", "xrp"]
 
-STRATEGIES = {
-    "DCA_Snipe"  : [f"strategies/DCA_Snipe/markets/{a}"         for a in ASSETS],
-    "YES+NO_1usd": [f"strategies/YES+NO_1usd/markets/{a}"       for a in ASSETS],
-}
 
-REQUIRED_PACKAGES = [
-    "py-clob-client",
-    "python-dotenv",
-    "requests",
-    "web3",
-    "eth-abi",
-    "websocket-client",
-    "questionary",
-]
+@functools.cache
+def _strategies() -> dict:
+    """Strategy name → market directories (relative to ROOT_DIR), built on first use."""
+    return {
+        "DCA_Snipe"  : [f"strategies/DCA_Snipe/markets/{a}"         for a in ASSETS],
+        "YES+NO_1usd": [f"strategies/YES+NO_1usd/markets/{a}"       for a in ASSETS],
+    }
 
-REQUIRED_VARS = [
-    "POLY_PRIVATE_KEY",
-    "FUNDER_ADDRESS",
-    "POLY_RPC",
-    "SIGNATURE_TYPE",
-    "POLY_API_KEY",
-    "POLY_API_SECRET",
-    "POLY_API_PASSPHRASE",
-]
+
+@functools.cache
+def _strategy_paths() -> tuple:
+    """(rel_path, absolute dir) per strategy market — joined once, reused by every check."""
+    return tuple(
+        (rel_path, ROOT_DIR / rel_path)
+        for paths in _strategies().values()
+        for rel_path in paths
+    )
+
+
+REQUIRED_PACKAGES = (
+    # (pip distribution,   import name)
+    ("py-clob-client",   "py_clob_client"),
+    ("python-dotenv",    "dotenv"),
+    ("requests",         "requests"),
+    ("web3",             "web3"),
+    ("eth-abi",          "eth_abi"),
+    ("websocket-client", "websocket"),
+    ("questionary",      "questionary"),
+)
 
 PROMPT_VARS = [
     # (env_key,              display_label,                                    is_secret)
@@ -56,6 +69,10 @@ PROMPT_VARS = [
     ("SIGNATURE_TYPE",   "Signature type  [0=EOA | 1=Magic | 2=Proxy]",        False),
 ]
 
+API_CRED_VARS = ("POLY_API_KEY", "POLY_API_SECRET", "POLY_API_PASSPHRASE")
+
+REQUIRED_VARS = [key for key, _, _ in PROMPT_VARS] + list(API_CRED_VARS)
+
 DEFAULT_ORDER_VARS = {
     "BUY_ORDER_TYPE"       : "FAK",
     "SELL_ORDER_TYPE"      : "FAK",
@@ -70,15 +87,56 @@ DEFAULT_ORDER_VARS = {
 #  DISPLAY HELPERS
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Steps running on a worker thread collect their lines here instead of
+# printing, so output can be flushed in the usual step order afterwards.
+_tls = threading.local()
+
+
+def _emit(line: str) -> None:
+    buf = getattr(_tls, "buf", None)
+    if buf is None:
+        print(line)
+    else:
+        buf.append(line)
+
+
+def _buffered(fn, *args, **kwargs):
+    """Run fn with output captured; returns (result, lines)."""
+    _tls.buf = []
+    try:
+        return fn(*args, **kwargs), _tls.buf
+    finally:
+        _tls.buf = None
+
+
+def _flush(buffered):
+    """Write the lines captured by _buffered() in one go and return the step result."""
+    result, lines = buffered
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    return result
+
+
+def _run_step(fn, *args, **kwargs):
+    """Run a non-interactive step, emitting its report as a single write."""
+    return _flush(_buffered(fn, *args, **kwargs))
+
+
 def header(title: str) -> None:
-    print(f"\n{'─' * 54}")
-    print(f"  {title}")
-    print(f"{'─' * 54}")
+    _emit(f"\n{'─' * 54}")
+    _emit(f"  {title}")
+    _emit(f"{'─' * 54}")
+
+def ok(msg: str)   -> None: _emit(f"  [✔] {msg}")
+def warn(msg: str) -> None: _emit(f"  [!] {msg}")
+def err(msg: str)  -> None: _emit(f"  [✘] {msg}")
+def info(msg: str) -> None: _emit(f"  [i] {msg}")
 
-def ok(msg: str)   -> None: print(f"  [✔] {msg}")
-def warn(msg: str) -> None: print(f"  [!] {msg}")
-def err(msg: str)  -> None: print(f"  [✘] {msg}")
-def info(msg: str) -> None: print(f"  [i] {msg}")
+
+def _mask(value: str) -> str:
+    """First 6 chars + ellipsis for display; short values are fully hidden."""
+    return value[:6] + "…" if len(value) > 8 else "****"
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -100,36 +158,43 @@ def check_python_version() -> bool:
 #  STEP 2 — Directory structure
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _dir_entries(path: Path):
+    """Names in a directory via a single os.scandir(); None if it does not exist."""
+    try:
+        with os.scandir(path) as it:
+            return {e.name for e in it}
+    except FileNotFoundError:
+        return None
+
+
 def check_directory_structure() -> bool:
     header("Project Structure")
     all_ok = True
 
-    # Root-level modules
+    # Root-level modules — one directory listing instead of a stat per file
+    root_entries = _dir_entries(ROOT_DIR)
     for fname in ["order_executor.py", "market_stream.py", "main.py", "auto_claim.py"]:
-        fpath = ROOT_DIR / fname
-        if fpath.exists():
+        if fname in root_entries:
             ok(fname)
         else:
             warn(f"{fname} not found — some features may not work")
 
     # Strategy directories + bot files
-    for strategy, paths in STRATEGIES.items():
-        for rel_path in paths:
-            bot_file  = ROOT_DIR / rel_path / "bot.py"
-            init_file = ROOT_DIR / rel_path / "__init__.py"
-
-            if not (ROOT_DIR / rel_path).exists():
-                warn(f"{rel_path}/ missing — creating ...")
-                (ROOT_DIR / rel_path).mkdir(parents=True, exist_ok=True)
-
-            if not init_file.exists():
-                init_file.write_text("")
-
-            if bot_file.exists():
-                ok(f"{rel_path}/bot.py")
-            else:
-                warn(f"{rel_path}/bot.py not found")
-                all_ok = False
+    for rel_path, dir_path in _strategy_paths():
+        entries = _dir_entries(dir_path)
+        if entries is None:
+            warn(f"{rel_path}/ missing — creating ...")
+            dir_path.mkdir(parents=True, exist_ok=True)
+            entries = set()
+
+        if "__init__.py" not in entries:
+            (dir_path / "__init__.py").write_text("")
+
+        if "bot.py" in entries:
+            ok(f"{rel_path}/bot.py")
+        else:
+            warn(f"{rel_path}/bot.py not found")
+            all_ok = False
 
     return all_ok
 
@@ -138,28 +203,27 @@ def check_directory_structure() -> bool:
 #  STEP 3 — Install packages
 # ══════════════════════════════════════════════════════════════════════════════
 
-def install_packages(check_only: bool = False) -> bool:
+def probe_packages() -> list:
+    """Report which required packages are importable; returns the missing ones."""
     header("Python Dependencies")
 
-    import_map = {
-        "py-clob-client"  : "py_clob_client",
-        "python-dotenv"   : "dotenv",
-        "requests"        : "requests",
-        "web3"            : "web3",
-        "eth-abi"         : "eth_abi",
-        "websocket-client": "websocket",
-        "questionary"     : "questionary",
-    }
-
+    # find_spec() only consults the import finders — it does not execute the
+    # package, so probing web3 / py-clob-client here costs next to nothing.
     missing = []
-    for pkg, import_name in import_map.items():
-        try:
-            __import__(import_name)
+    for pkg, import_name in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(import_name) is not None:
             ok(pkg)
-        except ImportError:
+        else:
             warn(f"{pkg}  — not installed")
             missing.append(pkg)
 
+    return missing
+
+
+def install_packages(check_only: bool = False, missing: list = None) -> bool:
+    if missing is None:
+        missing = probe_packages()
+
     if not missing:
         ok("All required packages are present.")
         return True
@@ -171,10 +235,17 @@ def install_packages(check_only: bool = False) -> bool:
 
     print(f"\n  Installing {len(missing)} missing package(s) ...")
     result = subprocess.run(
-        [sys.executable, "-m", "pip", "install", "--quiet"] + missing,
-        capture_output=False,
+        [sys.executable, "-m", "pip", "install", "--quiet",
+         "--disable-pip-version-check", "--no-input"] + missing,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1"},
     )
     if result.returncode != 0:
+        # pip output is only worth showing when something went wrong
+        for stream in (result.stdout, result.stderr):
+            for line in stream.strip().splitlines():
+                err(line)
         err("pip install failed. Check your internet connection and try again.")
         return False
 
@@ -186,38 +257,97 @@ def install_packages(check_only: bool = False) -> bool:
 #  .env read / write helpers
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Parsed .env keyed on (mtime_ns, size) — re-parsed only when the file changes.
+# "lines" / "index" ({key: line number}) back _write_env_values(); the index is
+# built on the first write after a change and kept in step with later writes.
+_ENV_CACHE = {"stamp": None, "data": None, "lines": None, "index": None}
+
+# KEY=value lines; comments and blank lines simply don't match
+_ENV_LINE_RE = re.compile(r"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*$")
+
+
+def _env_stamp():
+    try:
+        st = ENV_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _refresh_env_cache() -> bool:
+    """Re-parse .env if it changed since the last read. Returns False if it does not exist."""
+    stamp = _env_stamp()
+    if stamp is None:
+        return False
+    if _ENV_CACHE["stamp"] != stamp:
+        text = ENV_FILE.read_text(encoding="utf-8")
+        _ENV_CACHE["stamp"] = stamp
+        _ENV_CACHE["data"]  = dict(_ENV_LINE_RE.findall(text))
+        _ENV_CACHE["lines"] = text.splitlines()
+        _ENV_CACHE["index"] = None
+    return True
+
+
 def _read_env_raw() -> dict:
     """Read .env as raw key=value pairs without modifying os.environ."""
-    values = {}
-    if ENV_FILE.exists():
-        for line in ENV_FILE.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            k, _, v = line.partition("=")
-            values[k.strip()] = v.strip()
-    return values
+    if not _refresh_env_cache():
+        return {}
+    return dict(_ENV_CACHE["data"])
 
 
-def _write_env_value(key: str, value: str) -> None:
-    """Update or append a single key=value in .env, preserving comments and order."""
-    lines    = ENV_FILE.read_text(encoding="utf-8").splitlines() if ENV_FILE.exists() else []
-    new_line = f"{key}={value}"
-    updated  = False
+def _write_env_values(pairs: dict) -> None:
+    """Update or append several key=value pairs in .env with one read and one write."""
+    if not pairs:
+        return
 
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith("#") or "=" not in stripped:
-            continue
-        if stripped.partition("=")[0].strip() == key:
-            lines[i] = new_line
-            updated  = True
-            break
+    if _refresh_env_cache():
+        lines = _ENV_CACHE["lines"]
+        data  = _ENV_CACHE["data"]
+        index = _ENV_CACHE["index"]
+        if index is None:
+            index = {}
+            for i, line in enumerate(lines):
+                m = _ENV_LINE_RE.match(line)
+                if m:
+                    index.setdefault(m.group(1), i)
+    else:
+        lines, data, index = [], {}, {}
 
-    if not updated:
-        lines.append(new_line)
+    _ENV_CACHE["stamp"] = None
+    for key, value in pairs.items():
+        new_line = f"{key}={value}"
+        if key in index:
+            lines[index[key]] = new_line
+        else:
+            index[key] = len(lines)
+            lines.append(new_line)
+        data[key] = str(value).strip()
 
-    ENV_FILE.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # temp file + os.replace — an interrupted write never leaves a truncated .env.
+    # .env holds the private key, so the temp file gets the original's mode
+    # (0600 for a new file) before any secret is written to it.
+    try:
+        mode = stat.S_IMODE(ENV_FILE.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o600
+    fd, tmp_path = tempfile.mkstemp(prefix=".env.", suffix=".tmp", dir=ENV_FILE.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            os.chmod(tmp_path, mode)
+            fh.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, ENV_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _ENV_CACHE.update(stamp=_env_stamp(), data=data, lines=lines, index=index)
+
+
+def _write_env_value(key: str, value: str) -> None:
+    """Update or append a single key=value in .env, preserving comments and order."""
+    _write_env_values({key: value})
 
 
 def _ensure_env_skeleton() -> None:
@@ -258,14 +388,13 @@ def prompt_base_credentials(check_only: bool = False) -> bool:
 
     _ensure_env_skeleton()
     current      = _read_env_raw()
-    any_prompted = False
+    updates      = {}
 
     for key, label, is_secret in PROMPT_VARS:
         existing = current.get(key, "").strip()
 
         if existing:
-            masked = existing[:6] + "…" if len(existing) > 8 else "****"
-            ok(f"{key} = {masked}")
+            ok(f"{key} = {_mask(existing)}")
             continue
 
         if check_only:
@@ -285,15 +414,17 @@ def prompt_base_credentials(check_only: bool = False) -> bool:
                 break
             warn("  Value cannot be empty — please try again.")
 
-        _write_env_value(key, value)
+        updates[key] = current[key] = value
         ok(f"{key} saved.")
-        any_prompted = True
+
+    any_prompted = bool(updates)
 
     # Write default order/claim vars if absent
-    current = _read_env_raw()
     for k, v in DEFAULT_ORDER_VARS.items():
         if not current.get(k, "").strip():
-            _write_env_value(k, v)
+            updates[k] = v
+
+    _write_env_values(updates)
 
     if not any_prompted:
         ok("All wallet/network variables are already configured.")
@@ -305,27 +436,38 @@ def prompt_base_credentials(check_only: bool = False) -> bool:
 #  STEP 5 — Derive and save API credentials
 # ══════════════════════════════════════════════════════════════════════════════
 
-def derive_and_save_credentials(force: bool = False) -> bool:
+# py-clob-client pulls in web3 / eth-account — imported on first use only
+_ClobClient = None
+
+
+def _get_clob_client_cls():
+    global _ClobClient
+    if _ClobClient is None:
+        from py_clob_client.client import ClobClient as _ClobClient
+    return _ClobClient
+
+
+def derive_and_save_credentials(force: bool = False, check_only: bool = False) -> bool:
     header("API Credentials")
 
     current   = _read_env_raw()
-    cred_keys = ["POLY_API_KEY", "POLY_API_SECRET", "POLY_API_PASSPHRASE"]
-    all_present = all(current.get(k, "").strip() for k in cred_keys)
+    all_present = all(current.get(k, "").strip() for k in API_CRED_VARS)
 
-    if all_present and not force:
+    if all_present and (not force or check_only):
         ok("API credentials already present in .env")
-        for k in cred_keys:
-            v      = current[k]
-            masked = v[:6] + "…" if len(v) > 8 else "****"
-            ok(f"  {k} = {masked}")
+        for k in API_CRED_VARS:
+            ok(f"  {k} = {_mask(current[k])}")
         return True
 
+    if check_only:
+        err("API credentials missing or incomplete — re-run without --check-only to derive them")
+        return False
+
     if force:
         warn("--regen-keys requested — regenerating API credentials ...")
     else:
         warn("API credentials missing or incomplete — deriving now ...")
 
-    current     = _read_env_raw()
     private_key = current.get("POLY_PRIVATE_KEY", "").strip()
     funder      = current.get("FUNDER_ADDRESS",   "").strip()
     sig_type    = int(current.get("SIGNATURE_TYPE", "2"))
@@ -335,7 +477,7 @@ def derive_and_save_credentials(force: bool = False) -> bool:
         return False
 
     try:
-        from py_clob_client.client import ClobClient
+        ClobClient = _get_clob_client_cls()
     except ImportError:
         err("py-clob-client not installed — run: pip install py-clob-client")
         return False
@@ -353,35 +495,35 @@ def derive_and_save_credentials(force: bool = False) -> bool:
         info("Deriving credentials via EIP-712 signing ...")
         creds = client.create_or_derive_api_creds()
 
-        _write_env_value("POLY_API_KEY",        creds.api_key)
-        _write_env_value("POLY_API_SECRET",     creds.api_secret)
-        _write_env_value("POLY_API_PASSPHRASE", creds.api_passphrase)
+        _write_env_values({
+            "POLY_API_KEY"       : creds.api_key,
+            "POLY_API_SECRET"    : creds.api_secret,
+            "POLY_API_PASSPHRASE": creds.api_passphrase,
+        })
 
-        ok(f"POLY_API_KEY        = {creds.api_key[:6]}…")
-        ok(f"POLY_API_SECRET     = {creds.api_secret[:6]}…")
-        ok(f"POLY_API_PASSPHRASE = {creds.api_passphrase[:6]}…")
+        ok(f"POLY_API_KEY        = {_mask(creds.api_key)}")
+        ok(f"POLY_API_SECRET     = {_mask(creds.api_secret)}")
+        ok(f"POLY_API_PASSPHRASE = {_mask(creds.api_passphrase)}")
 
     except Exception as exc:
         err(f"Credential derivation failed: {exc}")
         return False
 
     # Smoke-test: verify credentials are accepted by the CLOB
+    # (reuses the deriving client — no second EIP-712 / HTTP session setup)
     try:
-        from py_clob_client.clob_types import ApiCreds
-        api_creds = ApiCreds(
-            api_key        = creds.api_key,
-            api_secret     = creds.api_secret,
-            api_passphrase = creds.api_passphrase,
-        )
-        client2 = ClobClient(
-            host           = CLOB_HOST,
-            key            = private_key,
-            chain_id       = CHAIN_ID,
-            creds          = api_creds,
-            signature_type = sig_type,
-            funder         = funder,
-        )
-        client2.get_api_keys()
+        try:
+            client.set_api_creds(creds)
+        except AttributeError:
+            client = ClobClient(
+                host           = CLOB_HOST,
+                key            = private_key,
+                chain_id       = CHAIN_ID,
+                creds          = creds,
+                signature_type = sig_type,
+                funder         = funder,
+            )
+        client.get_api_keys()
         ok("Credential verification passed — CLOB accepted the keys.")
     except Exception as exc:
         warn(f"Verification request failed: {exc}")
@@ -402,8 +544,7 @@ def validate_env() -> bool:
     for var in REQUIRED_VARS:
         value = current.get(var, "").strip()
         if value:
-            masked = value[:6] + "…" if len(value) > 8 else "****"
-            ok(f"{var} = {masked}")
+            ok(f"{var} = {_mask(value)}")
         else:
             err(f"{var} is empty or missing")
             all_ok = False
@@ -415,11 +556,32 @@ def validate_env() -> bool:
 #  STEP 7 — Network connectivity
 # ══════════════════════════════════════════════════════════════════════════════
 
+_HTTP_SESSION = None
+
+
+def _session():
+    """Shared requests.Session so repeated health checks reuse the HTTPS connection."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        import requests
+        _HTTP_SESSION = requests.Session()
+        _HTTP_SESSION.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        )
+    return _HTTP_SESSION
+
+
 def check_connectivity() -> bool:
     header("Network Connectivity")
+    if importlib.util.find_spec("requests") is None:
+        err("requests not installed — skipping CLOB reachability check")
+        return False
     try:
-        import requests
-        resp = requests.get(CLOB_HOST, timeout=8)
+        # HEAD — only the status line is needed, skip the body transfer
+        resp = _session().head(CLOB_HOST, timeout=8, allow_redirects=True)
+        if resp.status_code == 405:
+            resp = _session().get(CLOB_HOST, timeout=8, stream=True)
+            resp.close()
         if resp.status_code < 500:
             ok(f"Polymarket CLOB reachable  (HTTP {resp.status_code})")
             return True
@@ -444,22 +606,22 @@ def print_summary(results: dict) -> None:
             err(step)
             all_passed = False
 
-    print()
+    _emit("")
     if all_passed:
-        print("  ✅  Environment is ready. Start a bot with:")
-        print()
-        print("        Strategy 1 — DCA Snipe:")
-        print("          python main.py --operate btc")
-        print("          python main.py --operate btc eth sol xrp")
-        print()
-        print("        Strategy 2 — YES+NO Arbitrage:")
-        print("          python strategies/YES+NO_1usd/markets/btc/bot.py")
-        print()
-        print("        Auto Claim:")
-        print("          python auto_claim.py")
+        _emit("  ✅  Environment is ready. Start a bot with:")
+        _emit("")
+        _emit("        Strategy 1 — DCA Snipe:")
+        _emit("          python main.py --operate btc")
+        _emit("          python main.py --operate btc eth sol xrp")
+        _emit("")
+        _emit("        Strategy 2 — YES+NO Arbitrage:")
+        _emit("          python strategies/YES+NO_1usd/markets/btc/bot.py")
+        _emit("")
+        _emit("        Auto Claim:")
+        _emit("          python auto_claim.py")
     else:
-        print("  ❌  Some checks failed — fix the issues above and re-run setup.py")
-    print()
+        _emit("  ❌  Some checks failed — fix the issues above and re-run setup.py")
+    _emit("")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -489,16 +651,32 @@ def main():
     if args.check_only:
         info("Running in check-only mode — nothing will be modified.")
 
+    # Structure scan, package probe and the CLOB round trip are independent
+    # I/O waits — run them together; prompting below stays on the main thread.
+    pool     = ThreadPoolExecutor(max_workers=3)
+    f_struct = pool.submit(_buffered, check_directory_structure)
+    f_pkgs   = pool.submit(_buffered, probe_packages)
+    f_net    = pool.submit(_buffered, check_connectivity)
+    pool.shutdown(wait=False)
+
     results = {}
-    results["Python >= 3.9"]          = check_python_version()
-    results["Project structure"]       = check_directory_structure()
-    results["Python packages"]         = install_packages(check_only=args.check_only)
+    results["Python >= 3.9"]          = _run_step(check_python_version)
+    results["Project structure"]       = _flush(f_struct.result())
+    missing                            = _flush(f_pkgs.result())
+    results["Python packages"]         = install_packages(check_only=args.check_only, missing=missing)
     results["Wallet & network config"] = prompt_base_credentials(check_only=args.check_only)
-    results["API credentials"]         = derive_and_save_credentials(force=args.regen_keys)
-    results[".env validation"]         = validate_env()
-    results["Network / CLOB"]          = check_connectivity()
+    results["API credentials"]         = _run_step(derive_and_save_credentials,
+                                                   force=args.regen_keys, check_only=args.check_only)
+    results[".env validation"]         = _run_step(validate_env)
+
+    if "requests" in missing and results["Python packages"]:
+        # probe ran before requests was installed — check again now
+        f_net.result()
+        results["Network / CLOB"]      = _run_step(check_connectivity)
+    else:
+        results["Network / CLOB"]      = _flush(f_net.result())
 
-    print_summary(results)
+    _run_step(print_summary, results)
 
 
 if __name__ == "__main__":
@@ -22,8 +22,10 @@ The error was caused by two compounding issues:
    (e.g. waiting for DCA trigger), the shares are already sold on-chain.
    The bot's state.total_shares still holds the old value.
    On next DCA or bracket replacement it tries to SELL shares it no longer has.
-   FIX: poll open order status each tick. If tp_order_id is no longer open,
-   treat it as filled → log profit → break out of position loop cleanly.
+   FIX: watch bracket orders on the authenticated USER WebSocket channel
+   (REST order status is re-read only after a reconnect). If tp_order_id is
+   no longer open, treat it as filled → log profit → break out of position
+   loop cleanly.
 
 ═══════════════════════════════════════════════════════════════════════════════
 ENTRY ARMING
@@ -46,6 +48,22 @@ Break-even: STOP_LOSS=null   STOP_LOSS_OFFSET=null
             SL = avg_entry_price - 1 tick (zero-loss guaranteed)
             Updates after every DCA fill.
 
+═══════════════════════════════════════════════════════════════════════════════
+PERFORMANCE MODEL
+═══════════════════════════════════════════════════════════════════════════════
+This bot is I/O- and latency-bound. Every hot path is a REST request, a WSS
+message dispatch, or a handful of float ops per tick on two tokens — there is
+no array work that SIMD, GPU kernels or a JIT could speed up, so changes of
+that kind do not belong here. What does pay off, in order:
+
+1. WSS push over polling — prices, tick sizes and bracket fills arrive on the
+   market/user channels; the tick loop wakes on updates (wait_for_tick).
+2. Keep-alive HTTP — all REST goes through one pooled _SESSION.
+3. Fewer allocations per tick — tuple prices, cached countdown label.
+4. Integer-scaled 4dp truncation (_floor4dp) instead of Decimal.
+5. Concurrent I/O — current/next slug probes run side by side, and the
+   periodic open-orders resync runs on _IO_POOL while the loop keeps trading.
+
 ═══════════════════════════════════════════════════════════════════════════════
 .env variables
 ═══════════════════════════════════════════════════════════════════════════════
@@ -53,7 +71,7 @@ SOL_ENTRY_PRICE, SOL_AMOUNT_PER_BET, SOL_TAKE_PROFIT
 SOL_STOP_LOSS          fixed price | null → break-even mode
 SOL_STOP_LOSS_OFFSET   dynamic offset | null
 SOL_BET_STEP           null | float — DCA step
-SOL_POLL_INTERVAL      seconds between ticks
+SOL_POLL_INTERVAL      max seconds between ticks (WSS updates wake sooner)
 
 INTERVAL (runtime menu/argument):
   5m    | 15m | 1h    → timestamp-slug markets (e.g. sol-updown-1h-1740560400)
@@ -71,16 +89,31 @@ AUTOSET_UP_TP_SL_ORDERS=true|false
 
 import os
 import sys
+import signal
+import argparse
+import threading
+import math
+import random
+import functools
 import time
 import logging
 import requests
-from decimal import Decimal, ROUND_DOWN
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
+# orjson parses the raw response bytes several times faster than stdlib json;
+# stdlib json.loads also accepts bytes, so it is a drop-in fallback.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 # ── Path resolution ────────────────────────────────────────────────────────────
 def _find_root(marker: str) -> Path:
     p = Path(__file__).resolve().parent
@@ -90,12 +123,15 @@ def _find_root(marker: str) -> Path:
         p = p.parent
     raise FileNotFoundError(f"Cannot find '{marker}' walking up from {__file__}")
 
-_ROOT = _find_root("order_executor.py")
+# Resolved once per process — sibling bots (and child processes) reuse it
+_cached_root = os.getenv("_POLY_BOT_ROOT")
+_ROOT = Path(_cached_root) if _cached_root else _find_root("order_executor.py")
+os.environ.setdefault("_POLY_BOT_ROOT", str(_ROOT))
 load_dotenv(_ROOT / ".env")
 sys.path.insert(0, str(_ROOT))
 
-from order_executor import OrderExecutor
-from market_stream  import MarketStream
+from order_executor import OrderExecutor, OrderResult, tune_clob_transport
+from market_stream  import MarketStream, UserStream
 
 # ── Logging ────────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -137,6 +173,35 @@ USE_STOP_LOSS    = os.getenv("SOL_USE_STOP_LOSS", "true").strip().lower() not in
 
 SL_BREAKEVEN_MODE = USE_STOP_LOSS and (STOP_LOSS is None) and (STOP_LOSS_OFFSET is None)
 
+# Stop-loss rule resolved once from config: avg entry price → SL price (or None).
+# Offsets are truncated to 4dp (never rounded up past the intended level).
+# The matching display strings are fixed for the process lifetime too.
+if not USE_STOP_LOSS:
+    _compute_sl    = lambda avg: None
+    _SL_MODE_LABEL = ""
+    _SL_CFG        = "SL=DISABLED"
+elif STOP_LOSS_OFFSET is not None:
+    _compute_sl    = lambda avg: _floor4dp(avg - STOP_LOSS_OFFSET)
+    _SL_MODE_LABEL = "(dynamic)"
+    _SL_CFG        = f"SL_OFFSET={STOP_LOSS_OFFSET}(dynamic)"
+elif STOP_LOSS is not None:
+    _compute_sl    = lambda avg: STOP_LOSS
+    _SL_MODE_LABEL = "(fixed)"
+    _SL_CFG        = f"SL={STOP_LOSS}(fixed)"
+else:
+    # Break-even: SL = avg_price - 1 tick (prevents self-trigger)
+    _compute_sl    = lambda avg: _floor4dp(avg - 0.01)
+    _SL_MODE_LABEL = "(break-even)"
+    _SL_CFG        = "SL=avg_price(break-even)"
+
+# BotState.summary() template — only the per-position fields are filled per call
+_SUMMARY_TMPL = (
+    "  Side={side}  Bets={bets}  Shares={shares:.4f}"
+    "  Spent=${spent:.2f}  AvgP={avg:.4f}\n"
+    f"  SL={{sl}}  TP={TAKE_PROFIT}  [{f'DCA STEP={BET_STEP}' if BET_STEP else 'Single bet'}]\n"
+    "  tp_id={tp_id}  sl_id={sl_id}"
+)
+
 BUY_ORDER_TYPE  = (os.getenv("BUY_ORDER_TYPE")  or "FAK").upper()
 SELL_ORDER_TYPE = (os.getenv("SELL_ORDER_TYPE") or "GTC").upper()
 
@@ -145,22 +210,150 @@ SELL_ORDER_TYPE = (os.getenv("SELL_ORDER_TYPE") or "GTC").upper()
 # Requires approve_ctf.py to have been run at least once when true.
 AUTOSET_UP_TP_SL_ORDERS = os.getenv("AUTOSET_UP_TP_SL_ORDERS", "true").lower() not in ("false", "0", "no")
 
+# Config banner lines shared by run() and every run_window() header
+_ENTRY_CFG = f"ENTRY={ENTRY_PRICE}  BET=${AMOUNT_PER_BET}  TP={TAKE_PROFIT}"
+_MODE_CFG  = f"DCA every {BET_STEP} pts" if BET_STEP else "Single bet"
+_ORDER_CFG = (
+    f"BUY={BUY_ORDER_TYPE}  SELL={SELL_ORDER_TYPE}"
+    f"  AUTO_BRACKETS={'ON' if AUTOSET_UP_TP_SL_ORDERS else 'OFF'}"
+)
+
 _gtc_raw = os.getenv("GTC_TIMEOUT_SECONDS", "null").strip().lower()
 GTC_TIMEOUT: Optional[int] = None if _gtc_raw == "null" else int(_gtc_raw)
 
 WSS_READY_TIMEOUT = _float_env("WSS_READY_TIMEOUT", 10.0)
 
+# While the USER channel is down, re-read bracket status over REST this often
+STATUS_FALLBACK_SECS = 3.0
+# Safety net while it is up — catches any order event the channel dropped
+STATUS_SAFETY_SECS   = 30.0
+
+# Failed fallback SELLs back off exponentially with full jitter (capped so
+# an exit is still retried promptly once the API recovers)
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP  = 10.0
+
+# Tick cadence adapts AIMD-style to price-feed health: each failed price read
+# doubles the wait (up to POLL_INTERVAL_MAX), each good one trims POLL_AIMD_STEP
+# off it until it is back at POLL_INTERVAL.
+POLL_INTERVAL_MAX = 10.0
+POLL_AIMD_STEP    = 0.5
+
+# Bursts of WSS updates are coalesced to at most this many loop passes/sec
+MAX_TICKS_PER_SEC = 30
+
+# The per-tick status line is repeated only when a price has moved by a full
+# tick, or at least this often while prices sit still
+HEARTBEAT_SECS = 10.0
+
+# A locally tracked share balance younger than this is trusted for fallback
+# SELLs, skipping the positions round trip on the exit path
+BALANCE_FRESH_SECS = 5.0
+
+# A DCA that grows the position by less than this fraction (and moves the SL
+# by under one tick) leaves the resting brackets alone instead of cancelling
+# and re-posting both — the small remainder resolves with the market
+BRACKET_RESIZE_MIN = 0.05
+
+# Smallest GTC SELL the CLOB accepts on these markets; a leftover below it
+# cannot be bracketed and is left to resolve with the market
+GTC_MIN_SHARES     = 5.0
+
+# While the market channel is down its cached quotes stop moving; any older
+# than this are re-read over REST before thresholds are checked against them
+PRICE_STALE_SECS = 1.0
+
+# The next window's market is looked up in the background from this long
+# before the current one ends, re-probing every PREFETCH_PROBE_SECS
+PREFETCH_LEAD_SECS  = 30.0
+PREFETCH_PROBE_SECS = 2.0
+
+# With no active market, discovery re-probes every DISCOVERY_RETRY_SECS but
+# never sleeps past the next window boundary, and probes every
+# PREFETCH_PROBE_SECS for the first DISCOVERY_FAST_SECS after one — the
+# span in which the new market is being listed
+DISCOVERY_RETRY_SECS = 15.0
+DISCOVERY_FAST_SECS  = 30.0
+
 CLOB_HOST = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
 DATA_API  = "https://data-api.polymarket.com"
 CHAIN_ID  = 137
 
+_MARKETS_URL = f"{GAMMA_API}/markets"   # fetch_market endpoint, built once
+
+# Balance lookups — resolved once; shares sit on the FUNDER (SignatureType=2)
+_FUNDER        = os.getenv("FUNDER_ADDRESS", "")
+_POSITIONS_URL = f"{DATA_API}/positions"
+
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled keep-alive session for every REST call (market discovery, REST
+# midpoint fallback, balance checks) so each request skips a fresh TLS handshake.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+_ADAPTER = HTTPAdapter(
+    pool_connections = 4,
+    pool_maxsize     = 16,
+    max_retries      = Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 502, 503, 504)),
+)
+for _host in (CLOB_HOST, GAMMA_API, DATA_API):
+    _SESSION.mount(_host, _ADAPTER)
+
+
+class _RateTracker:
+    """
+    Reads rate-limit headers off every _SESSION response and pauses the next
+    background lookup (market discovery, open-orders resync) once the budget
+    is nearly spent, instead of running into 429s. Calls on the tick loop and
+    exit paths (REST midpoints, balances) never wait here, so TP/SL fallbacks
+    and the window-close cancel are not held up.
+
+      Retry-After (on 429)                → wait that many seconds
+      X-RateLimit-Remaining ≤ 10% of Limit → wait until X-RateLimit-Reset
+    """
+
+    MAX_PAUSE = 30.0
+
+    def __init__(self):
+        self._resume_at = 0.0
+
+    def update(self, resp, *args, **kwargs):
+        h     = resp.headers
+        delay = 0.0
+        try:
+            if resp.status_code == 429 and "Retry-After" in h:
+                delay = float(h["Retry-After"])
+            else:
+                remaining = h.get("X-RateLimit-Remaining")
+                limit     = h.get("X-RateLimit-Limit")
+                if remaining is not None and limit and float(remaining) <= 0.1 * float(limit):
+                    reset = float(h.get("X-RateLimit-Reset", 1.0))
+                    # Reset is either seconds-until or an epoch timestamp
+                    delay = reset - time.time() if reset > 1e9 else reset
+        except ValueError:
+            return resp
+        if delay > 0:
+            self._resume_at = max(self._resume_at, time.monotonic() + min(delay, self.MAX_PAUSE))
+        return resp
+
+    def wait_if_throttled(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            log.warning(f"[rate-limit] Budget nearly spent — pausing {delay:.1f}s")
+            _shutdown.wait(delay)   # stop() cuts the pause short
+
+
+_RATE = _RateTracker()
+_SESSION.hooks["response"].append(_RATE.update)
+
+# %-templates: discovery formats one or two of these every 15s
 SLUG_TEMPLATES = {
-    "5m":  "sol-updown-5m-{ts}",
-    "15m": "sol-updown-15m-{ts}",
-    "1h":  "sol-updown-1h-{ts}",
+    "5m":  "sol-updown-5m-%d",
+    "15m": "sol-updown-15m-%d",
+    "1h":  "sol-updown-1h-%d",
 }
 WINDOW_SECONDS = {"5m": 300, "15m": 900, "1h": 3600, "1h_et": 3600, "24h": 86400}
+DEFAULT_INTERVAL = "5m"   # used when started without --interval and no TTY
 
 # ── ET-dated slug helpers ──────────────────────────────────────────────────────
 _COIN_PREFIX = "solana"
@@ -177,15 +370,25 @@ def _et_now() -> datetime:
     except ImportError:
         return datetime.now(timezone(timedelta(hours=-5)))
 
+# Slugs are memoized on plain (month, day[, hour]) ints — discovery polls the
+# same one or two slugs every 15s, so each is only formatted once.
+@functools.lru_cache(maxsize=64)
+def _slug_1h_et(month: int, day: int, hour: int) -> str:
+    h12 = hour % 12 or 12
+    ap  = "am" if hour < 12 else "pm"
+    return f"{_COIN_PREFIX}-up-or-down-{_MONTH_NAMES[month]}-{day}-{h12}{ap}-et"
+
+@functools.lru_cache(maxsize=64)
+def _slug_24h(month: int, day: int) -> str:
+    return f"{_COIN_PREFIX}-up-or-down-on-{_MONTH_NAMES[month]}-{day}"
+
 def _fmt_slug_1h_et(dt: datetime) -> str:
     """e.g. solana-up-or-down-february-26-10am-et"""
-    h12 = dt.hour % 12 or 12
-    ap  = "am" if dt.hour < 12 else "pm"
-    return f"{_COIN_PREFIX}-up-or-down-{_MONTH_NAMES[dt.month]}-{dt.day}-{h12}{ap}-et"
+    return _slug_1h_et(dt.month, dt.day, dt.hour)
 
 def _fmt_slug_24h(dt: datetime) -> str:
     """e.g. solana-up-or-down-on-february-26"""
-    return f"{_COIN_PREFIX}-up-or-down-on-{_MONTH_NAMES[dt.month]}-{dt.day}"
+    return _slug_24h(dt.month, dt.day)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -213,6 +416,7 @@ def build_clob_client():
         creds=creds, signature_type=sig, funder=fund,
     )
     client.set_api_creds(creds)
+    tune_clob_transport()
     return client
 
 
@@ -222,14 +426,15 @@ def build_clob_client():
 
 def get_current_window_timestamp(interval: str) -> int:
     window = WINDOW_SECONDS[interval]
-    return (int(datetime.now(timezone.utc).timestamp()) // window) * window
+    return (int(time.time()) // window) * window
 
 
 def fetch_market(slug: str) -> Optional[dict]:
+    _RATE.wait_if_throttled()
     try:
-        resp = requests.get(f"{GAMMA_API}/markets", params={"slug": slug}, timeout=10)
+        resp = _SESSION.get(_MARKETS_URL, params={"slug": slug}, timeout=(2.0, 5.0))
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         if isinstance(data, list) and data:
             return data[0]
         if isinstance(data, dict) and data.get("slug") == slug:
@@ -239,16 +444,38 @@ def fetch_market(slug: str) -> Optional[dict]:
     return None
 
 
-def wait_for_active_market(interval: str) -> dict:
+# Small shared pool for overlapping independent REST calls: the current- and
+# next-window slug probes during discovery, and the open-orders resync plus
+# the bracket cancel on a fallback exit while trading. Three workers cover the
+# most of these that run at once, so an exit never queues behind a lookup.
+_IO_POOL = ThreadPoolExecutor(max_workers=3, thread_name_prefix="bot-io")
+
+# The next-market prefetch sleeps until PREFETCH_LEAD_SECS before the window
+# ends, so it gets its own worker rather than parking one of _IO_POOL's.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-prefetch")
+
+# Order actions that do not gate the next decision — bracket posting after a
+# fill and the bracket cancels — run here. One worker, so they execute in
+# submission order and a cancel never overtakes the post it is meant to undo.
+_ORDER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-orders")
+
+# Set by stop() — the market search, tick loop and inter-window wait all
+# return promptly instead of sleeping out their full timeout
+_shutdown = threading.Event()
+
+
+def stop():
+    """Ask run() to return at its next wait (main.py shutdown / SIGTERM)."""
+    _shutdown.set()
+
+
+def wait_for_active_market(interval: str) -> Optional[dict]:
     log.info(f"Searching for active SOL {interval.upper()} market ...")
     while True:
         if interval in ("5m", "15m", "1h"):
-            window = WINDOW_SECONDS[interval]
-            ts     = get_current_window_timestamp(interval)
-            slugs  = [
-                SLUG_TEMPLATES[interval].format(ts=ts),
-                SLUG_TEMPLATES[interval].format(ts=ts + window),
-            ]
+            ts    = get_current_window_timestamp(interval)
+            tpl   = SLUG_TEMPLATES[interval]
+            slugs = [tpl % candidate for candidate in (ts, ts + WINDOW_SECONDS[interval])]
         elif interval == "1h_et":
             now   = _et_now()
             slugs = [_fmt_slug_1h_et(now), _fmt_slug_1h_et(now + timedelta(hours=1))]
@@ -256,111 +483,248 @@ def wait_for_active_market(interval: str) -> dict:
             now   = _et_now()
             slugs = [_fmt_slug_24h(now), _fmt_slug_24h(now + timedelta(days=1))]
 
-        for slug in slugs:
-            market = fetch_market(slug)
+        futures = [_IO_POOL.submit(fetch_market, s) for s in slugs]
+        for slug, fut in zip(slugs, futures):
+            market = fut.result()
             if market and market.get("active") and not market.get("closed"):
                 log.info(f"Found market: {slug}")
                 log.info(f"  End date : {market.get('endDate') or market.get('end_date_iso')}")
                 return market
-        log.info("No active market — retrying in 15s ...")
-        time.sleep(15)
+        delay = _discovery_delay(interval)
+        log.info(f"No active market — retrying in {delay:.1f}s ...")
+        if _shutdown.wait(delay):
+            return None
+
+
+def _discovery_delay(interval: str) -> float:
+    """Seconds until the next wait_for_active_market probe."""
+    if interval == "24h":   # daily markets roll over on ET dates
+        return DISCOVERY_RETRY_SECS
+    window = WINDOW_SECONDS[interval]
+    since  = time.time() % window
+    if since < DISCOVERY_FAST_SECS:
+        return PREFETCH_PROBE_SECS
+    return min(DISCOVERY_RETRY_SECS, window - since)
+
+
+def _prefetch_next_market(interval: str, end_ts: float, client) -> Optional[dict]:
+    """
+    Find the market for the window that starts at end_ts. Sleeps until
+    PREFETCH_LEAD_SECS before it, then probes its slug every
+    PREFETCH_PROBE_SECS until it is listed active (None if it never is).
+    The found market's tick sizes are loaded into _TICK_CACHE as well.
+    """
+    if _shutdown.wait(max(0.0, end_ts - PREFETCH_LEAD_SECS - time.time())):
+        return None
+    if interval in ("5m", "15m", "1h"):
+        slugs = [SLUG_TEMPLATES[interval] % int(end_ts)]
+    else:
+        nxt = datetime.fromtimestamp(end_ts + 60, _et_now().tzinfo)
+        if interval == "1h_et":
+            slugs = [_fmt_slug_1h_et(nxt)]
+        else:  # "24h" — which date labels the next day is settled by its end time
+            slugs = [_fmt_slug_24h(nxt), _fmt_slug_24h(nxt + timedelta(days=1))]
+
+    while time.time() < end_ts + PREFETCH_LEAD_SECS:
+        for slug in slugs:
+            market = fetch_market(slug)
+            if market and market.get("active") and not market.get("closed"):
+                end_time = get_market_end_time(market)
+                if end_time is None or end_time.timestamp() > end_ts:
+                    log.info(f"Prefetched next market: {slug}")
+                    for tok in parse_market_tokens(market).values():
+                        get_tick_size_rest(client, tok["token_id"])
+                    return market
+        if _shutdown.wait(PREFETCH_PROBE_SECS):
+            return None
+    return None
+
+
+# Outcome labels that map to the UP side — matched as-is, no .lower() per outcome
+_UP_NAMES = frozenset(("up", "yes", "UP", "YES", "Up", "Yes"))
 
 
 def parse_market_tokens(market: dict) -> dict:
-    import json as _json
+    # Parsed once per market dict — later calls reuse the stashed result
+    cached = market.get("_parsed_tokens")
+    if cached is not None:
+        return cached
+
     outcomes = market.get("outcomes",      "[]")
     prices   = market.get("outcomePrices", "[0.5,0.5]")
     tokens   = market.get("clobTokenIds") or market.get("clob_token_ids", "[]")
-    outcomes = _json.loads(outcomes) if isinstance(outcomes, str) else outcomes
-    prices   = [float(p) for p in (_json.loads(prices) if isinstance(prices, str) else prices)]
-    tokens   = _json.loads(tokens)   if isinstance(tokens, str) else tokens
+    outcomes = _json_loads(outcomes) if isinstance(outcomes, str) else outcomes
+    prices   = [float(p) for p in (_json_loads(prices) if isinstance(prices, str) else prices)]
+    tokens   = _json_loads(tokens)   if isinstance(tokens, str) else tokens
     result   = {}
-    for i, name in enumerate(outcomes):
-        key = "UP" if name.lower() in ("up", "yes") else "DOWN"
-        result[key] = {
-            "token_id": tokens[i] if i < len(tokens) else None,
-            "price":    prices[i] if i < len(prices) else 0.5,
-        }
+    for name, tok, pr in zip(outcomes, tokens, prices):
+        result["UP" if name in _UP_NAMES else "DOWN"] = {"token_id": tok, "price": pr}
+    market["_parsed_tokens"] = result
     return result
 
 
 def get_market_end_time(market: dict) -> Optional[datetime]:
+    if "_end_time" in market:
+        return market["_end_time"]
+
+    end_time = None
     for field in ("endDate", "end_date_iso", "closedTime"):
         val = market.get(field)
         if val:
             try:
-                return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                end_time = datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                break
             except Exception:
                 continue
-    return None
+    market["_end_time"] = end_time
+    return end_time
+
+
+# token_id → tick size. Filled by REST (window start or the next-market
+# prefetch) and kept current by WSS tick_size_change events; pruned to the
+# live window's tokens at each window start.
+_TICK_CACHE: Dict[str, float] = {}
 
 
 def get_tick_size_rest(client, token_id: str) -> float:
+    cached = _TICK_CACHE.get(token_id)
+    if cached is not None:
+        return cached
     try:
         resp = client.get_tick_size(token_id)
-        return float(resp) if resp else 0.01
     except Exception:
         return 0.01
+    if not resp:
+        return 0.01
+    _TICK_CACHE[token_id] = tick = float(resp)
+    return tick
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  REAL BALANCE QUERY
 # ══════════════════════════════════════════════════════════════════════════════
 
-def get_token_balance(client, token_id: str) -> Optional[float]:
+_BALANCE_TTL   = 0.5   # seconds a positions snapshot is reused
+_balance_cache = {"at": 0.0, "data": None}
+
+
+def get_all_balances(client) -> Optional[dict]:
     """
-    Query the actual on-chain token balance from Polymarket data-api positions endpoint.
-    Returns real shares held, or None if the query fails.
+    Query every position held by the FUNDER in one REST call.
+    Returns {token_id: shares} (truncated to 4dp), or None if the query fails.
 
     Uses data-api.polymarket.com (not clob.polymarket.com/data/positions which returns 404).
-    Filters the response list by the `asset` field matching token_id.
-    `size` in the response is the actual shares currently held.
+    `asset` is the token id and `size` the shares currently held.
+
+    The snapshot is reused for _BALANCE_TTL seconds so back-to-back lookups
+    (e.g. bracket verification right after a fallback check) share one
+    round trip.
 
     NOTE: Uses FUNDER address (not EOA). With SignatureType=2, shares are
     held by the FUNDER account on-chain, not the signing EOA.
     """
+    now = time.monotonic()
+    if _balance_cache["data"] is not None and now - _balance_cache["at"] < _BALANCE_TTL:
+        return _balance_cache["data"]
     try:
-        funder = getattr(client, "funder", None) or os.getenv("FUNDER_ADDRESS", "")
-        resp = requests.get(
-            f"{DATA_API}/positions",
+        funder = getattr(client, "funder", None) or _FUNDER
+        resp = _SESSION.get(
+            _POSITIONS_URL,
             params  = {"user": funder, "sizeThreshold": ".01", "limit": 200},
-            timeout = 5,
+            timeout = (1.5, 3.0),
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
+        balances = {}
         if isinstance(data, list):
             for pos in data:
-                if str(pos.get("asset", "")) == str(token_id):
+                tid = str(pos.get("asset", ""))
+                if tid:
                     raw = pos.get("size", 0)
-                    return float(Decimal(str(raw)).quantize(Decimal("0.0001"), rounding=ROUND_DOWN))
-        # token not found → no open position, treat as 0
-        return 0.0
+                    balances[tid] = _floor4dp(float(raw))
     except Exception as exc:
-        log.warning(f"[balance] Failed to fetch position for token {token_id[:12]}...: {exc}")
-    return None
+        log.warning(f"[balance] Failed to fetch positions: {exc}")
+        return None
+    _balance_cache["at"]   = now
+    _balance_cache["data"] = balances
+    return balances
+
+
+def get_token_balance(client, token_id: str) -> Optional[float]:
+    """
+    Real shares held for one token, or None if the query fails.
+    A token missing from the positions list means no open position → 0.0.
+
+    This is used before placing SELL orders to avoid "Not Enough Allowance"
+    caused by overestimated shares in state.total_shares.
+    """
+    balances = get_all_balances(client)
+    return balances.get(str(token_id), 0.0) if balances is not None else None
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  ORDER STATUS CHECK
 # ══════════════════════════════════════════════════════════════════════════════
 
-def is_order_open(client, order_id: str) -> bool:
-    """
-    Returns True if the GTC order is still open/resting in the book.
-    Returns False if it was filled, cancelled, or not found.
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+
 
-    Used to detect when a TP or SL bracket order was silently filled
-    while the bot was in its polling loop.
+def _fetch_open_order_ids(client, token_id: str) -> Optional[set]:
     """
+    IDs of all open orders resting on token_id, in one REST call.
+    Returns None if the query fails (callers must not treat that as "filled").
+    """
+    from py_clob_client.clob_types import OpenOrderParams
+    _RATE.wait_if_throttled()
     try:
-        resp = client.get_order(order_id)
-        if not resp or not isinstance(resp, dict):
-            return False
-        status = resp.get("status", "").upper()
-        # OPEN, LIVE, UNMATCHED = still in book
-        return status in ("OPEN", "LIVE", "UNMATCHED", "PENDING")
-    except Exception:
-        return False
+        orders = client.get_orders(OpenOrderParams(asset_id=token_id)) or []
+        return {o.get("id") for o in orders if isinstance(o, dict)}
+    except Exception as exc:
+        log.warning(f"[orders] Failed to fetch open orders: {exc}")
+        return None
+
+
+def brackets_closed(client, user_stream: UserStream, state: "BotState") -> tuple:
+    """
+    Return (tp_closed, sl_closed) for the current bracket orders.
+
+    Fills and cancels are pushed over the USER channel, so the normal path
+    costs no REST calls. Events sent while the socket was down are not
+    replayed — open orders are re-read over REST (one batched call for both
+    brackets) once after every (re)connect, every STATUS_FALLBACK_SECS while
+    the stream stays down, and every STATUS_SAFETY_SECS while it is up.
+
+    The REST read runs on _IO_POOL so the tick never blocks on it; its answer
+    is picked up on a later tick and only applies to the bracket IDs that
+    were live when it was issued.
+    """
+    pending = state._resync_pending
+    if pending is not None and pending[0].done():
+        state._resync_pending = None
+        future, generation, tp_id, sl_id = pending
+        open_ids = future.result()
+        if open_ids is not None:     # on failure the generation is kept → re-issued
+            state._user_generation = generation
+            tp_closed = bool(tp_id) and tp_id == state.tp_order_id and tp_id not in open_ids
+            sl_closed = bool(sl_id) and sl_id == state.sl_order_id and sl_id not in open_ids
+            if tp_closed or sl_closed:
+                return tp_closed, sl_closed
+    elif pending is None:
+        now      = time.monotonic()
+        interval = STATUS_SAFETY_SECS if user_stream.is_connected else STATUS_FALLBACK_SECS
+        if (user_stream.generation != state._user_generation
+                or now - state._last_rest_sync >= interval):
+            state._last_rest_sync = now
+            state._resync_pending = (
+                _IO_POOL.submit(_fetch_open_order_ids, client, state.token_id),
+                user_stream.generation, state.tp_order_id, state.sl_order_id,
+            )
+
+    tp_closed = bool(state.tp_order_id) and user_stream.is_closed(state.tp_order_id)
+    sl_closed = bool(state.sl_order_id) and user_stream.is_closed(state.sl_order_id)
+    return tp_closed, sl_closed
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -369,28 +733,90 @@ def is_order_open(client, order_id: str) -> bool:
 
 def fetch_midpoint_rest(token_id: str) -> Optional[float]:
     try:
-        resp = requests.get(
-            f"{CLOB_HOST}/midpoint", params={"token_id": token_id}, timeout=5
+        # Hot path while WSS is down — a timeout just skips this tick
+        resp = _SESSION.get(
+            f"{CLOB_HOST}/midpoint", params={"token_id": token_id}, timeout=(1.0, 2.0)
         )
         resp.raise_for_status()
-        return float(resp.json()["mid"])
+        return float(_json_loads(resp.content)["mid"])
     except Exception:
         return None
 
 
-def get_prices(stream: MarketStream, token_up: str, token_down: str) -> Optional[dict]:
-    up   = stream.get_midpoint(token_up)   or fetch_midpoint_rest(token_up)
-    down = stream.get_midpoint(token_down) or fetch_midpoint_rest(token_down)
+def fetch_midpoints_rest(token_ids) -> Dict[str, float]:
+    """
+    Midpoints for several tokens in one POST /midpoints round trip. Tokens
+    the CLOB has no midpoint for are left out. Falls back to one /midpoint
+    call per token only if the CLOB rejects the batch request itself.
+    """
+    try:
+        resp = _SESSION.post(
+            f"{CLOB_HOST}/midpoints", json=[{"token_id": t} for t in token_ids],
+            timeout=(1.0, 2.0),
+        )
+        resp.raise_for_status()
+        data = _json_loads(resp.content)
+        return {t: float(data[t]) for t in token_ids if data.get(t) is not None}
+    except requests.HTTPError:
+        mids = {}
+        for t in token_ids:
+            mid = fetch_midpoint_rest(t)
+            if mid is not None:
+                mids[t] = mid
+        return mids
+    except Exception:
+        return {}
+
+
+def get_prices(stream: MarketStream, token_up: str, token_down: str) -> Optional[tuple]:
+    """
+    Return (up, down, age) — WSS midpoints from a single stream snapshot,
+    REST only for a side the stream lacks or, while it is disconnected, holds
+    older than PRICE_STALE_SECS. age is the staler side's WSS age in seconds,
+    None when REST supplied a side.
+    """
+    snap = stream.snapshot((token_up, token_down))
+    up,   _, up_age   = snap[token_up]
+    down, _, down_age = snap[token_down]
+    if not stream.is_connected:
+        if up and up_age > PRICE_STALE_SECS:
+            up = None
+        if down and down_age > PRICE_STALE_SECS:
+            down = None
+    if up and down:
+        return up, down, max(up_age, down_age)
+
+    if not up and not down:
+        mids = fetch_midpoints_rest((token_up, token_down))
+        up, down = mids.get(token_up), mids.get(token_down)
+    else:
+        up   = up   or fetch_midpoint_rest(token_up)
+        down = down or fetch_midpoint_rest(token_down)
     if up is None or down is None:
         return None
-    return {"UP": up, "DOWN": down}
+    return up, down, None
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  SAFE SHARES PARSER  — the fix for "Not Enough Allowance"
 # ══════════════════════════════════════════════════════════════════════════════
 
-def _parse_bet_result(resp: dict, fallback_price: float, fallback_usdc: float):
+def _floor4dp(x: float) -> float:
+    """
+    Truncate to 4 decimal places — strictly floor, never round up.
+
+    Integer math instead of Decimal(str(x)).quantize(ROUND_DOWN). The inner
+    round(..., 6) absorbs IEEE noise (1.6666 * 10000 = 16665.999999999998)
+    so exact 4dp inputs are not pushed down a step; fill amounts carry at
+    most 6dp, so it can never lift a value past the next 4dp boundary.
+
+    Shared by fill parsing and balance queries so every share count the bot
+    sells is truncated the same way and never exceeds what the wallet holds.
+    """
+    return math.floor(round(x * 10000, 6)) / 10000
+
+
+def _parse_bet_result(resp: OrderResult, fallback_price: float, fallback_usdc: float):
     """
     Extract (shares, cost) from order response.
 
@@ -405,28 +831,15 @@ def _parse_bet_result(resp: dict, fallback_price: float, fallback_usdc: float):
     With this fix: fallback = floor(1.00/0.60, 4dp) = 1.6666 shares
     SELL order for ≤ 1.6666 shares → OK ✔
     """
-    try:
-        shares = float(resp.get("takingAmount", 0))
-        usdc   = float(resp.get("makingAmount", 0))
-
-        if shares > 0:
-            # API returned actual fill amount — still truncate to 4dp for safety
-            shares = float(Decimal(str(shares)).quantize(Decimal("0.0001"), rounding=ROUND_DOWN))
-        else:
-            # Fallback estimate — use ROUND_DOWN to avoid overestimating
-            shares = float(
-                (Decimal(str(fallback_usdc)) / Decimal(str(fallback_price)))
-                .quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-            )
+    if resp.filled_shares > 0:
+        # API returned actual fill amount — still truncate to 4dp for safety
+        shares = _floor4dp(resp.filled_shares)
+    else:
+        # Fallback estimate — truncate to avoid overestimating
+        shares = _floor4dp(fallback_usdc / fallback_price)
 
-        usdc = usdc if usdc > 0 else fallback_usdc
-        return shares, usdc
-    except Exception:
-        safe_shares = float(
-            (Decimal(str(fallback_usdc)) / Decimal(str(fallback_price)))
-            .quantize(Decimal("0.0001"), rounding=ROUND_DOWN)
-        )
-        return safe_shares, fallback_usdc
+    usdc = resp.usdc_paid if resp.usdc_paid > 0 else fallback_usdc
+    return shares, usdc
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -434,6 +847,16 @@ def _parse_bet_result(resp: dict, fallback_price: float, fallback_usdc: float):
 # ══════════════════════════════════════════════════════════════════════════════
 
 class BotState:
+    # Read on every tick — slots skip the per-instance __dict__ lookup
+    __slots__ = (
+        "side", "token_id", "entry_price", "last_bet_price", "avg_price",
+        "total_shares", "total_spent", "effective_stop_loss", "next_bet_trigger",
+        "bets_count", "in_position", "tp_order_id", "sl_order_id",
+        "tp_last_posted", "sl_last_posted", "entry_armed",
+        "_user_generation", "_last_rest_sync", "_resync_pending",
+        "sell_failures", "token_balance", "token_balance_ts", "_last_eval_cp",
+    )
+
     def __init__(self):
         self.reset()
 
@@ -446,53 +869,151 @@ class BotState:
         self.total_shares        : float           = 0.0
         self.total_spent         : float           = 0.0
         self.effective_stop_loss : Optional[float] = None
+        self.next_bet_trigger    : Optional[float] = None   # DCA price; None if BET_STEP unset
         self.bets_count          : int             = 0
         self.in_position         : bool            = False
         self.tp_order_id         : Optional[str]   = None
         self.sl_order_id         : Optional[str]   = None
+        # Size / SL price the resting brackets were posted with
+        self.tp_last_posted      : Optional[float] = None
+        self.sl_last_posted      : Optional[float] = None
         self.entry_armed         : bool            = False
-        # Tick counter for order status polling (check every N ticks, not every tick)
-        self._ticks_since_status_check : int = 0
+        # USER-channel generation last reconciled over REST (see brackets_closed)
+        self._user_generation    : int             = 0
+        self._last_rest_sync     : float           = 0.0
+        # In-flight resync: (future, generation, tp_order_id, sl_order_id)
+        self._resync_pending     : Optional[tuple] = None
+        # Consecutive failed fallback SELLs (drives _backoff_delay)
+        self.sell_failures       : int             = 0
+        # Last known wallet balance of token_id (see fresh_balance)
+        self.token_balance       : Optional[float] = None
+        self.token_balance_ts    : float           = 0.0
+        # Price at which the in-position thresholds were last checked with no
+        # action taken — a wake with the same price has nothing new to decide
+        self._last_eval_cp       : Optional[float] = None
 
     def update_after_bet(self, bet_price: float, usdc_paid: float, shares: float):
         self.total_shares += shares
         self.total_spent  += usdc_paid
         self.avg_price     = self.total_spent / self.total_shares if self.total_shares else bet_price
 
-        if USE_STOP_LOSS:
-            if STOP_LOSS_OFFSET is not None:
-                self.effective_stop_loss = round(self.avg_price - STOP_LOSS_OFFSET, 4)
-            elif STOP_LOSS is not None:
-                self.effective_stop_loss = STOP_LOSS
-            else:
-                # Break-even: SL = avg_price - 1 tick (prevents self-trigger)
-                self.effective_stop_loss = round(self.avg_price - 0.01, 4)
-        else:
-            self.effective_stop_loss = None
+        self.effective_stop_loss = _compute_sl(self.avg_price)
 
         self.last_bet_price = bet_price
+        self.next_bet_trigger = round(bet_price + BET_STEP, 4) if BET_STEP is not None else None
         self.bets_count    += 1
         self.in_position    = True
+        self.set_balance((self.token_balance or 0.0) + shares)
+        self._last_eval_cp  = None   # thresholds / brackets changed
+
+    def shrink_to_unbracketed(self, balance: Optional[float]) -> bool:
+        """
+        After a bracket leg filled and the other was cancelled: keep the DCA
+        shares the brackets were not resized for (see _brackets_current).
+
+        balance is the wallet balance read over REST after the cancel. The
+        remainder is capped by it, so shares the brackets were clamped away
+        from are never re-sold. False (position done) if the balance is
+        unknown or the remainder is too small to bracket.
+        """
+        if balance is None:
+            return False
+        remainder = min(balance, self.total_shares - (self.tp_last_posted or self.total_shares))
+        if remainder < max(0.0001, GTC_MIN_SHARES):
+            return False
+        self.total_shares   = remainder
+        self.total_spent    = self.avg_price * remainder
+        self.tp_order_id    = None
+        self.sl_order_id    = None
+        self.tp_last_posted = None
+        self.sl_last_posted = None
+        self.set_balance(balance)
+        self._last_eval_cp  = None
+        return True
+
+    def set_balance(self, shares: float):
+        self.token_balance    = shares
+        self.token_balance_ts = time.monotonic()
+
+    def fresh_balance(self) -> Optional[float]:
+        """Tracked balance if updated within BALANCE_FRESH_SECS, else None."""
+        if self.token_balance is None or time.monotonic() - self.token_balance_ts >= BALANCE_FRESH_SECS:
+            return None
+        return self.token_balance
 
     def summary(self) -> str:
         if not USE_STOP_LOSS:
             sl_val = "DISABLED"
+        elif self.effective_stop_loss:
+            sl_val = f"{self.effective_stop_loss:.4f}{_SL_MODE_LABEL}"
         else:
-            sl_mode = "(dynamic)" if STOP_LOSS_OFFSET else "(break-even)" if SL_BREAKEVEN_MODE else "(fixed)"
-            sl_val  = f"{self.effective_stop_loss:.4f}{sl_mode}" if self.effective_stop_loss else "none"
-        mode    = f"DCA STEP={BET_STEP}" if BET_STEP else "Single bet"
-        return (
-            f"  Side={self.side}  Bets={self.bets_count}  Shares={self.total_shares:.4f}"
-            f"  Spent=${self.total_spent:.2f}  AvgP={self.avg_price:.4f}\n"
-            f"  SL={sl_val}  TP={TAKE_PROFIT}  [{mode}]\n"
-            f"  tp_id={self.tp_order_id or 'none'}  sl_id={self.sl_order_id or 'none'}"
-        )
+            sl_val = "none"
+        return _SUMMARY_TMPL.format_map({
+            "side":   self.side,
+            "bets":   self.bets_count,
+            "shares": self.total_shares,
+            "spent":  self.total_spent,
+            "avg":    self.avg_price,
+            "sl":     sl_val,
+            "tp_id":  self.tp_order_id or "none",
+            "sl_id":  self.sl_order_id or "none",
+        })
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  BRACKET ORDERS
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _brackets_matched(state: BotState, user_stream: UserStream) -> bool:
+    """
+    True if a resting bracket may have sold shares the tracked balance does
+    not know about — either leg has a (partial) fill on the USER channel, or
+    the channel is down and fills could have been missed.
+    """
+    if not user_stream.is_connected:
+        return True
+    return any(
+        order_id and user_stream.matched_size(order_id) > 0
+        for order_id in (state.tp_order_id, state.sl_order_id)
+    )
+
+
+def _cancel_and_fetch_balance(executor: OrderExecutor, client, state: BotState,
+                              user_stream: UserStream) -> Optional[float]:
+    """
+    Cancel resting brackets and resolve the sellable balance in parallel.
+
+    The tracked balance only grows on buys, so it is skipped for a REST read
+    once a bracket has matched any size.
+
+    The fallback SELL itself still waits for the cancel: resting SELL orders
+    reserve their shares, so posting before the cancel lands would be
+    rejected on balance.
+    """
+    cancel   = _IO_POOL.submit(executor.gtc_tracker.cancel_all, log)
+    real_bal = None if _brackets_matched(state, user_stream) else state.fresh_balance()
+    if real_bal is None:
+        real_bal = get_token_balance(client, state.token_id)
+    cancel.result()
+    return real_bal
+
+
+def _brackets_current(state: BotState, tick_size: float) -> bool:
+    """True if the resting TP/SL already cover the position closely enough."""
+    if not state.tp_order_id or not state.tp_last_posted:
+        return False
+    sl = state.effective_stop_loss
+    if sl is not None:
+        if not state.sl_order_id or state.sl_last_posted is None:
+            return False
+        if abs(sl - state.sl_last_posted) >= tick_size:
+            return False
+    elif state.sl_order_id:
+        return False
+    delta = state.total_shares - state.tp_last_posted
+    return 0.0 <= delta < BRACKET_RESIZE_MIN * state.tp_last_posted
+
+
 def place_brackets(executor: OrderExecutor, state: BotState, tick_size: float,
                    client=None):
     """
@@ -500,22 +1021,32 @@ def place_brackets(executor: OrderExecutor, state: BotState, tick_size: float,
 
     Before placing, optionally queries real balance to prevent "Not Enough
     Allowance". Uses the lower of state.total_shares vs actual wallet balance.
+    Skipped when the resting brackets already match to within
+    BRACKET_RESIZE_MIN / one tick.
     """
-    # Cancel old bracket orders
-    for oid in [state.tp_order_id, state.sl_order_id]:
-        if oid:
-            try:
-                executor.gtc_tracker.cancel(oid, log)
-            except Exception:
-                pass
-    state.tp_order_id = None
-    state.sl_order_id = None
+    if _brackets_current(state, tick_size):
+        log.info(
+            f"  [bracket] Resting brackets still current "
+            f"(posted {state.tp_last_posted:.4f} / now {state.total_shares:.4f} shares) — keeping"
+        )
+        return
+
+    # Cancel old bracket orders — both legs in one batch request
+    try:
+        executor.gtc_tracker.cancel_many((state.tp_order_id, state.sl_order_id), log)
+    except Exception:
+        pass
+    state.tp_order_id    = None
+    state.sl_order_id    = None
+    state.tp_last_posted = None
+    state.sl_last_posted = None
 
     # ── Verify shares against real balance ────────────────────────────────────
     shares_to_sell = state.total_shares
     if client is not None:
         real_balance = get_token_balance(client, state.token_id)
         if real_balance is not None:
+            state.set_balance(real_balance)
             if real_balance < shares_to_sell:
                 log.warning(
                     f"  [bracket] Real balance {real_balance:.4f} < state {shares_to_sell:.4f} "
@@ -529,9 +1060,8 @@ def place_brackets(executor: OrderExecutor, state: BotState, tick_size: float,
         log.warning("  [bracket] Shares too small to place SELL orders — skipping")
         return
 
-    sl_disp = "DISABLED" if not USE_STOP_LOSS else (f"{state.effective_stop_loss:.4f}" if state.effective_stop_loss else "none")
-    sl_mode = " (break-even)" if SL_BREAKEVEN_MODE else ""
-    log.info(f"  Placing brackets: TP={TAKE_PROFIT}  SL={sl_disp}{sl_mode}  shares={shares_to_sell:.4f}")
+    sl_disp = "DISABLED" if not USE_STOP_LOSS else (f"{state.effective_stop_loss:.4f}{_SL_MODE_LABEL}" if state.effective_stop_loss else "none")
+    log.info(f"  Placing brackets: TP={TAKE_PROFIT}  SL={sl_disp}  shares={shares_to_sell:.4f}")
 
     result = executor.place_sell_bracket(
         token_id     = state.token_id,
@@ -542,6 +1072,9 @@ def place_brackets(executor: OrderExecutor, state: BotState, tick_size: float,
     )
     state.tp_order_id = result.get("tp_order_id")
     state.sl_order_id = result.get("sl_order_id")
+    if state.tp_order_id:
+        state.tp_last_posted = shares_to_sell
+        state.sl_last_posted = state.effective_stop_loss if state.sl_order_id else None
 
     if not state.tp_order_id:
         log.warning("  TP bracket failed — will monitor price manually")
@@ -549,44 +1082,81 @@ def place_brackets(executor: OrderExecutor, state: BotState, tick_size: float,
         log.warning("  SL bracket failed — will monitor price manually")
 
 
+def _post_brackets(executor: OrderExecutor, state: BotState, tick_size: float, client):
+    """place_brackets + position summary, run on _ORDER_POOL after a fill."""
+    place_brackets(executor, state, tick_size, client=client)
+    log.info(state.summary())
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 #  MAIN WINDOW LOOP
 # ══════════════════════════════════════════════════════════════════════════════
 
-def run_window(market: dict, executor: OrderExecutor, state: BotState, interval: str):
+def run_window(market: dict, executor: OrderExecutor, state: BotState,
+               interval: str) -> Optional[Future]:
+    """Trade one window; returns the pending lookup of the next window's market."""
     tokens     = parse_market_tokens(market)
     end_time   = get_market_end_time(market)
     token_up   = tokens["UP"]["token_id"]
     token_down = tokens["DOWN"]["token_id"]
-    tick_up    = get_tick_size_rest(executor.client, token_up)
-    tick_down  = get_tick_size_rest(executor.client, token_down)
     client     = executor.client
-
-    sl_cfg = (
-        "SL=DISABLED" if not USE_STOP_LOSS
-        else f"SL_OFFSET={STOP_LOSS_OFFSET}(dynamic)" if STOP_LOSS_OFFSET
-        else "SL=avg_price(break-even)" if SL_BREAKEVEN_MODE
-        else f"SL={STOP_LOSS}(fixed)"
-    )
-    mode_str = f"DCA every {BET_STEP} pts" if BET_STEP else "Single bet"
+    # Tick sizes are read once per window (usually already cached by the
+    # prefetch); the stream pushes any change (prices near 0.04 / 0.96)
+    # through on_tick_size_change.
+    ticks      = {
+        token_up  : get_tick_size_rest(client, token_up),
+        token_down: get_tick_size_rest(client, token_down),
+    }
+    for tid in [t for t in _TICK_CACHE if t not in ticks]:
+        del _TICK_CACHE[tid]
+
+    def _on_tick_size_change(token_id: str, tick_size: float):
+        ticks[token_id] = _TICK_CACHE[token_id] = tick_size
 
     log.info("=" * 60)
     log.info(f"  SOL DCA | Market: {market.get('id','')}")
     log.info(f"  Interval   : {interval.upper()}")
     log.info(f"  End time   : {end_time}")
-    log.info(f"  ENTRY={ENTRY_PRICE}  BET=${AMOUNT_PER_BET}  TP={TAKE_PROFIT}")
-    log.info(f"  {sl_cfg}  {mode_str}")
-    log.info(f"  BUY={BUY_ORDER_TYPE}  SELL={SELL_ORDER_TYPE}  AUTO_BRACKETS={'ON' if AUTOSET_UP_TP_SL_ORDERS else 'OFF'}")
+    log.info(f"  {_ENTRY_CFG}")
+    log.info(f"  {_SL_CFG}  {_MODE_CFG}")
+    log.info(f"  {_ORDER_CFG}")
     log.info("=" * 60)
 
-    stream = MarketStream(asset_ids=[token_up, token_down])
+    # Arming is a one-shot transition: it is decided on the WSS thread as
+    # quotes arrive, and the callback unhooks itself once it has fired
+    def _arm_on_update(token_id: str, mid: float):
+        if state.entry_armed or state.in_position:
+            stream.on_price_update = None
+            return
+        up, down = stream.get_midpoint(token_up), stream.get_midpoint(token_down)
+        if up and down and up < ENTRY_PRICE and down < ENTRY_PRICE:
+            state.entry_armed      = True
+            stream.on_price_update = None
+            log.info(f"  Entry armed — prices dipped below {ENTRY_PRICE} (UP={up:.4f} DOWN={down:.4f})")
+
+    stream = MarketStream(
+        asset_ids           = [token_up, token_down],
+        on_price_update     = _arm_on_update,
+        on_tick_size_change = _on_tick_size_change,
+    )
+
+    # USER channel — pushes TP/SL fills so they need not be polled over REST;
+    # a closed order wakes the tick loop straight away.
+    user_stream = UserStream(
+        client.creds,
+        markets         = [market.get("conditionId")],
+        on_order_closed = lambda order_id, status: stream.wake(),
+    )
+    user_stream.start()
+
     stream.start()
     ready = stream.wait_ready(timeout=WSS_READY_TIMEOUT)
     if ready:
-        tick_up   = stream.get_tick_size(token_up)   or tick_up
-        tick_down = stream.get_tick_size(token_down) or tick_down
-        mid_up    = stream.get_midpoint(token_up)
-        mid_down  = stream.get_midpoint(token_down)
+        snap = stream.snapshot((token_up, token_down))
+        mid_up,   tick_up,   _ = snap[token_up]
+        mid_down, tick_down, _ = snap[token_down]
+        ticks[token_up]   = tick_up   or ticks[token_up]
+        ticks[token_down] = tick_down or ticks[token_down]
         log.info(
             f"[WSS] Connected  "
             f"UP={f'{mid_up:.4f}' if mid_up else 'pending'}  "
@@ -595,36 +1165,76 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
     else:
         log.warning(f"[WSS] Not ready after {WSS_READY_TIMEOUT}s — using REST fallback")
 
+    # Window end as a monotonic deadline — the tick loop compares plain
+    # floats, is immune to NTP steps mid-window, and only rebuilds time_label
+    # when the whole-second countdown moves. end_ts (wall clock) names the
+    # next window for the prefetch.
+    end_ts     = end_time.timestamp() if end_time else None
+    end_mono   = time.monotonic() + (end_ts - time.time()) if end_ts is not None else None
+    last_tl    = None
+    time_label = ""
+    # Per-tick heartbeat lines are only formatted when INFO is actually emitted
+    log_ticks  = log.isEnabledFor(logging.INFO)
+    hb_up      = hb_down = 0.0   # prices on the last status line
+    hb_next    = 0.0             # monotonic time the next one is due regardless
+    poll       = POLL_INTERVAL
+    next_mkt   = None
+    orders     = None   # bracket post in flight on _ORDER_POOL
+
+    # Close the window on a timer rather than at the next poll: the timer
+    # wakes any wait_for_tick in progress, so no tick runs past end time.
+    window_over = threading.Event()
+    expiry      = None
+    if end_mono is not None:
+        def _on_window_end():
+            window_over.set()
+            stream.wake()
+        expiry = threading.Timer(max(0.0, end_mono - time.monotonic()), _on_window_end)
+        expiry.daemon = True
+        expiry.start()
+
     try:
-        while True:
+        while not _shutdown.is_set():
             # ── Window expiry ──────────────────────────────────────────────────
-            now = datetime.now(timezone.utc)
-            if end_time and now >= end_time:
+            if window_over.is_set():
                 log.info("Window closed — cancelling all open bracket orders.")
-                executor.gtc_tracker.cancel_all(log)
+                _ORDER_POOL.submit(executor.gtc_tracker.cancel_all, log).result()
                 break
 
-            time_left  = (end_time - now).total_seconds() if end_time else 999
-            _tl        = int(time_left)
-            _hrs       = _tl // 3600
-            _min       = (_tl % 3600) // 60
-            _sec       = _tl % 60
-            time_label = f"{_hrs}h{_min:02d}m" if _hrs > 0 else f"{_min:02d}:{_sec:02d}"
-
-            # ── Sync tick sizes ────────────────────────────────────────────────
-            tick_up   = stream.get_tick_size(token_up)   or tick_up
-            tick_down = stream.get_tick_size(token_down) or tick_down
+            _tl = int(end_mono - time.monotonic()) if end_mono is not None else 999
+            if next_mkt is None and _tl < PREFETCH_LEAD_SECS:
+                next_mkt = _PREFETCH_POOL.submit(_prefetch_next_market, interval, end_ts, client)
+            if log_ticks and _tl != last_tl:
+                last_tl    = _tl
+                _hrs       = _tl // 3600
+                _min       = (_tl % 3600) // 60
+                _sec       = _tl % 60
+                time_label = f"{_hrs}h{_min:02d}m" if _hrs > 0 else f"{_min:02d}:{_sec:02d}"
 
             # ── Price read ─────────────────────────────────────────────────────
             prices = get_prices(stream, token_up, token_down)
             if prices is None:
-                log.warning("Price fetch failed — skipping tick")
-                time.sleep(POLL_INTERVAL)
+                poll = min(POLL_INTERVAL_MAX, poll * 2)
+                log.warning(f"Price fetch failed — skipping tick (next try in {poll:.1f}s)")
+                window_over.wait(poll)
                 continue
-
-            up_price   = prices["UP"]
-            down_price = prices["DOWN"]
-            src        = "WSS" if stream.is_connected else "REST"
+            if poll > POLL_INTERVAL:
+                poll = max(POLL_INTERVAL, poll - POLL_AIMD_STEP)
+
+            up_price, down_price, age = prices
+            beat = log_ticks and (
+                abs(up_price - hb_up) >= ticks[token_up] - 1e-9
+                or abs(down_price - hb_down) >= ticks[token_down] - 1e-9
+                or time.monotonic() >= hb_next
+            )
+            src = ""
+            if beat:
+                hb_up, hb_down = up_price, down_price
+                hb_next = time.monotonic() + HEARTBEAT_SECS
+                if stream.is_connected:
+                    src = f"WSS {age * 1000:.0f}ms" if age is not None and math.isfinite(age) else "WSS"
+                else:
+                    src = "REST"
 
             # ══════════════════════════════════════════════════════════════════
             #  PHASE 1 — Waiting for entry
@@ -632,6 +1242,8 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
             if not state.in_position:
 
                 # ── Entry arming ───────────────────────────────────────────────
+                # Normally already done by _arm_on_update; this covers prices
+                # read over REST while the stream is down
                 if not state.entry_armed:
                     if up_price < ENTRY_PRICE and down_price < ENTRY_PRICE:
                         state.entry_armed = True
@@ -640,11 +1252,12 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                             f"(UP={up_price:.4f} DOWN={down_price:.4f})"
                         )
                     else:
-                        log.info(
-                            f"[{time_label}]  UP={up_price:.4f}  DOWN={down_price:.4f}"
-                            f"  | Waiting to arm at ENTRY={ENTRY_PRICE}  {src}"
-                        )
-                        time.sleep(POLL_INTERVAL)
+                        if beat:
+                            log.info(
+                                f"[{time_label}]  UP={up_price:.4f}  DOWN={down_price:.4f}"
+                                f"  | Waiting to arm at ENTRY={ENTRY_PRICE}  {src}"
+                            )
+                        stream.wait_for_tick(poll, min_gap=1 / MAX_TICKS_PER_SEC)
                         continue
 
                 # ── Entry trigger ──────────────────────────────────────────────
@@ -653,9 +1266,9 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                 trig_tick  = 0.01
 
                 if up_price >= ENTRY_PRICE:
-                    trig_side, trig_price, trig_tick = "UP",   up_price,   tick_up
+                    trig_side, trig_price, trig_tick = "UP",   up_price,   ticks[token_up]
                 elif down_price >= ENTRY_PRICE:
-                    trig_side, trig_price, trig_tick = "DOWN", down_price, tick_down
+                    trig_side, trig_price, trig_tick = "DOWN", down_price, ticks[token_down]
 
                 if trig_side:
                     log.info(
@@ -666,14 +1279,14 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                     state.token_id    = token_up if trig_side == "UP" else token_down
                     state.entry_price = trig_price
 
-                    resp = executor.place_buy(
+                    resp = OrderResult.from_response(executor.place_buy(
                         token_id  = state.token_id,
                         price     = trig_price,
                         usdc_size = AMOUNT_PER_BET,
                         tick_size = trig_tick,
-                    )
+                    ))
 
-                    if resp and resp.get("success"):
+                    if resp and resp.success:
                         shares, usdc_paid = _parse_bet_result(resp, trig_price, AMOUNT_PER_BET)
                         log.info(
                             f"  BET #1 filled | shares={shares:.4f}  "
@@ -681,14 +1294,15 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                         )
                         state.update_after_bet(trig_price, usdc_paid, shares)
                         if AUTOSET_UP_TP_SL_ORDERS:
-                            place_brackets(executor, state, trig_tick, client=client)
+                            orders = _ORDER_POOL.submit(_post_brackets, executor, state, trig_tick, client)
+                            orders.add_done_callback(lambda _f: stream.wake())
                         else:
                             log.info("  AUTOSET_UP_TP_SL_ORDERS=false — brackets skipped, monitoring manually")
-                        log.info(state.summary())
+                            log.info(state.summary())
                     else:
                         log.warning(f"  BET #1 failed (no fill) — resp={resp} — continuing")
                         state.reset()
-                else:
+                elif beat:
                     log.info(
                         f"[{time_label}]  UP={up_price:.4f}  DOWN={down_price:.4f}"
                         f"  | Armed, waiting for ENTRY={ENTRY_PRICE}  {src}"
@@ -699,58 +1313,93 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
             # ══════════════════════════════════════════════════════════════════
             else:
                 cp        = up_price if state.side == "UP" else down_price
-                tick_size = tick_up  if state.side == "UP" else tick_down
-
-                log.info(
-                    f"[{time_label}]  {state.side}={cp:.4f}"
-                    f"  AvgP={state.avg_price:.4f}"
-                    f"  SL={'OFF' if not USE_STOP_LOSS else f'{state.effective_stop_loss:.4f}'}"
-                    f"  TP={TAKE_PROFIT}"
-                    f"  Shares={state.total_shares:.4f}"
-                    f"  {src}"
-                )
+                tick_size = ticks[state.token_id]
+
+                if beat:
+                    log.info(
+                        f"[{time_label}]  {state.side}={cp:.4f}"
+                        f"  AvgP={state.avg_price:.4f}"
+                        f"  SL={'OFF' if not USE_STOP_LOSS else f'{state.effective_stop_loss:.4f}'}"
+                        f"  TP={TAKE_PROFIT}"
+                        f"  Shares={state.total_shares:.4f}"
+                        f"  {src}"
+                    )
+
+                # ── Bracket post in flight ─────────────────────────────────────
+                # The order worker owns the bracket fields until it finishes;
+                # prices keep streaming and its completion wakes the loop.
+                if orders is not None:
+                    if not orders.done():
+                        stream.wait_for_tick(poll, min_gap=1 / MAX_TICKS_PER_SEC)
+                        continue
+                    if orders.exception() is not None:
+                        log.error(f"  Bracket placement failed: {orders.exception()}")
+                    orders = None
+                    state._last_eval_cp = None
 
                 # ── Check if bracket orders were silently filled ───────────────
-                # Poll every 6 ticks (~3s at default 0.5s interval) to avoid
-                # hammering the API on every tick.
-                state._ticks_since_status_check += 1
-                if state._ticks_since_status_check >= 6:
-                    state._ticks_since_status_check = 0
-
-                    # TP filled externally?
-                    if state.tp_order_id and not is_order_open(client, state.tp_order_id):
-                        pnl = (TAKE_PROFIT - state.avg_price) * state.total_shares
+                # Pushed over the USER channel; REST only after a reconnect.
+                tp_closed, sl_closed = brackets_closed(client, user_stream, state)
+
+                # TP filled externally?
+                if tp_closed:
+                    filled = state.tp_last_posted or state.total_shares
+                    pnl    = (TAKE_PROFIT - state.avg_price) * filled
+                    log.info(
+                        f"*** TAKE PROFIT FILLED (detected via order status) ***\n"
+                        f"  TP={TAKE_PROFIT}  AvgP={state.avg_price:.4f}"
+                        f"  Shares={filled:.4f}"
+                        f"  Est. P&L=+${pnl:.4f}"
+                    )
+                    # Cancel the orphaned SL order
+                    _ORDER_POOL.submit(executor.gtc_tracker.cancel_all, log).result()
+                    if state.shrink_to_unbracketed(get_token_balance(client, state.token_id)):
                         log.info(
-                            f"*** TAKE PROFIT FILLED (detected via order status) ***\n"
-                            f"  TP={TAKE_PROFIT}  AvgP={state.avg_price:.4f}"
-                            f"  Shares={state.total_shares:.4f}"
-                            f"  Est. P&L=+${pnl:.4f}"
+                            f"  {state.total_shares:.4f} DCA shares were outside the filled "
+                            f"bracket — re-bracketing them"
                         )
-                        # Cancel the orphaned SL order
-                        executor.gtc_tracker.cancel_all(log)
-                        log.info("  Resetting state — looking for next entry in this window ...")
-                        state.reset()
+                        orders = _ORDER_POOL.submit(_post_brackets, executor, state, tick_size, client)
+                        orders.add_done_callback(lambda _f: stream.wake())
                         continue
+                    log.info("  Resetting state — looking for next entry in this window ...")
+                    state.reset()
+                    continue
 
-                    # SL filled externally?
-                    if USE_STOP_LOSS and state.sl_order_id and not is_order_open(client, state.sl_order_id):
-                        pnl = (state.effective_stop_loss - state.avg_price) * state.total_shares
+                # SL filled externally?
+                if USE_STOP_LOSS and sl_closed:
+                    filled = state.tp_last_posted or state.total_shares
+                    pnl    = (state.effective_stop_loss - state.avg_price) * filled
+                    log.info(
+                        f"*** STOP LOSS FILLED (detected via order status) ***\n"
+                        f"  SL={state.effective_stop_loss:.4f}  AvgP={state.avg_price:.4f}"
+                        f"  Shares={filled:.4f}"
+                        f"  Est. P&L=${pnl:.4f}"
+                    )
+                    _ORDER_POOL.submit(executor.gtc_tracker.cancel_all, log).result()
+                    if state.shrink_to_unbracketed(get_token_balance(client, state.token_id)):
                         log.info(
-                            f"*** STOP LOSS FILLED (detected via order status) ***\n"
-                            f"  SL={state.effective_stop_loss:.4f}  AvgP={state.avg_price:.4f}"
-                            f"  Shares={state.total_shares:.4f}"
-                            f"  Est. P&L=${pnl:.4f}"
+                            f"  {state.total_shares:.4f} DCA shares were outside the filled "
+                            f"bracket — re-bracketing them"
                         )
-                        executor.gtc_tracker.cancel_all(log)
-                        log.info("  Resetting state — looking for next entry in this window ...")
-                        state.reset()
+                        orders = _ORDER_POOL.submit(_post_brackets, executor, state, tick_size, client)
+                        orders.add_done_callback(lambda _f: stream.wake())
                         continue
+                    log.info("  Resetting state — looking for next entry in this window ...")
+                    state.reset()
+                    continue
+
+                # TP / SL / DCA thresholds are re-checked only when the price
+                # moved (timeout wakes with an unchanged price skip them) or
+                # the previous check acted and must be retried.
+                if cp == state._last_eval_cp:
+                    stream.wait_for_tick(poll, min_gap=1 / MAX_TICKS_PER_SEC)
+                    continue
+                state._last_eval_cp = cp
 
                 # ── Manual fallback: TP ────────────────────────────────────────
                 if not state.tp_order_id and cp >= TAKE_PROFIT:
                     log.info(f"*** TP FALLBACK: {state.side}={cp:.4f} >= {TAKE_PROFIT} — selling ***")
-                    executor.gtc_tracker.cancel_all(log)
-                    real_bal = get_token_balance(client, state.token_id)
+                    real_bal = _cancel_and_fetch_balance(executor, client, state, user_stream)
                     sell_shares = real_bal if real_bal is not None else state.total_shares
                     resp = executor.place_sell_immediate(
                         token_id      = state.token_id,
@@ -764,7 +1413,9 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                         log.info("  Resetting state — looking for next entry in this window ...")
                         state.reset()
                         continue
-                    time.sleep(POLL_INTERVAL)
+                    window_over.wait(POLL_INTERVAL + _backoff_delay(state.sell_failures))
+                    state.sell_failures += 1
+                    state._last_eval_cp = None
                     continue
 
                 # ── Manual fallback: SL ────────────────────────────────────────
@@ -773,17 +1424,11 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                     and state.effective_stop_loss is not None
                     and cp <= state.effective_stop_loss
                 ):
-                    sl_label = (
-                        "(break-even)" if SL_BREAKEVEN_MODE
-                        else "(dynamic)"  if STOP_LOSS_OFFSET
-                        else "(fixed)"
-                    )
                     log.info(
-                        f"*** SL FALLBACK {sl_label}: {state.side}={cp:.4f} "
+                        f"*** SL FALLBACK {_SL_MODE_LABEL}: {state.side}={cp:.4f} "
                         f"<= {state.effective_stop_loss:.4f} — selling ***"
                     )
-                    executor.gtc_tracker.cancel_all(log)
-                    real_bal = get_token_balance(client, state.token_id)
+                    real_bal = _cancel_and_fetch_balance(executor, client, state, user_stream)
                     sell_shares = real_bal if real_bal is not None else state.total_shares
                     resp = executor.place_sell_immediate(
                         token_id      = state.token_id,
@@ -797,107 +1442,134 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState, interval:
                         log.info("  Resetting state — looking for next entry in this window ...")
                         state.reset()
                         continue
-                    time.sleep(POLL_INTERVAL)
+                    window_over.wait(POLL_INTERVAL + _backoff_delay(state.sell_failures))
+                    state.sell_failures += 1
+                    state._last_eval_cp = None
                     continue
 
                 # ── DCA ────────────────────────────────────────────────────────
-                if BET_STEP is not None:
-                    next_bet = round(state.last_bet_price + BET_STEP, 4)
+                next_bet = state.next_bet_trigger
+                if next_bet is not None:
                     if cp >= next_bet:
                         log.info(
                             f"*** DCA #{state.bets_count + 1}: {state.side}={cp:.4f}"
                             f" >= {next_bet:.4f} ***"
                         )
-                        resp = executor.place_buy(
+                        resp = OrderResult.from_response(executor.place_buy(
                             token_id  = state.token_id,  # SAME token as initial buy
                             price     = cp,
                             usdc_size = AMOUNT_PER_BET,
                             tick_size = tick_size,
-                        )
-                        if resp and resp.get("success"):
+                        ))
+                        if resp and resp.success:
                             shares, usdc_paid = _parse_bet_result(resp, cp, AMOUNT_PER_BET)
                             log.info(f"  DCA filled | shares={shares:.4f}  usdc=${usdc_paid:.4f}")
                             state.update_after_bet(cp, usdc_paid, shares)
                             # Replace brackets with updated total + new SL
                             if AUTOSET_UP_TP_SL_ORDERS:
-                                place_brackets(executor, state, tick_size, client=client)
+                                orders = _ORDER_POOL.submit(_post_brackets, executor, state, tick_size, client)
+                                orders.add_done_callback(lambda _f: stream.wake())
                             else:
                                 log.info("  AUTOSET_UP_TP_SL_ORDERS=false — brackets skipped, monitoring manually")
-                            log.info(state.summary())
+                                log.info(state.summary())
                         else:
                             log.warning(f"  DCA failed (no fill) — resp={resp} — continuing")
+                            state._last_eval_cp = None
 
-            time.sleep(POLL_INTERVAL)
+            # Wake on the next WSS price update; poll caps the wait when the
+            # stream is quiet or down.
+            stream.wait_for_tick(poll, min_gap=1 / MAX_TICKS_PER_SEC)
 
     finally:
-        log.info("[WSS] Closing market channel.")
+        if expiry is not None:
+            expiry.cancel()
+        log.info("[WSS] Closing market and user channels.")
         stream.stop()
+        user_stream.stop()
 
     log.info("Window loop ended.")
+    return next_mkt
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  ENTRY POINT
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _prompt_interval() -> str:
+    """Ask for the market interval interactively (questionary, else input())."""
+    try:
+        import questionary
+        choice = questionary.select(
+            "Select market interval:",
+            choices=["5 minutes", "15 minutes", "1 hour", "1 hour (ET dated)", "24 hours"],
+        ).ask()
+        if choice is None:
+            sys.exit(0)
+        return {
+            "5 minutes":         "5m",
+            "15 minutes":        "15m",
+            "1 hour":            "1h",
+            "1 hour (ET dated)": "1h_et",
+            "24 hours":          "24h",
+        }[choice]
+    except (ImportError, Exception):
+        while True:
+            c = input("Market interval — enter 5, 15, 60, 1h_et, or 24h: ").strip().lower()
+            if c == "5":     return "5m"
+            if c == "15":    return "15m"
+            if c == "60":    return "1h"
+            if c == "1h_et": return "1h_et"
+            if c == "24h":   return "24h"
+
+
 def run(interval: Optional[str] = None):
     if interval is None:
-        try:
-            import questionary
-            choice = questionary.select(
-                "Select market interval:",
-                choices=["5 minutes", "15 minutes", "1 hour", "1 hour (ET dated)", "24 hours"],
-            ).ask()
-            if choice is None:
-                sys.exit(0)
-            interval = {
-                "5 minutes":         "5m",
-                "15 minutes":        "15m",
-                "1 hour":            "1h",
-                "1 hour (ET dated)": "1h_et",
-                "24 hours":          "24h",
-            }[choice]
-        except (ImportError, Exception):
-            while True:
-                c = input("Market interval — enter 5, 15, 60, 1h_et, or 24h: ").strip().lower()
-                if c == "5":     interval = "5m";    break
-                if c == "15":    interval = "15m";   break
-                if c == "60":    interval = "1h";    break
-                if c == "1h_et": interval = "1h_et"; break
-                if c == "24h":   interval = "24h";   break
-
-    sl_cfg = (
-        "SL=DISABLED" if not USE_STOP_LOSS
-        else f"SL_OFFSET={STOP_LOSS_OFFSET}(dynamic)" if STOP_LOSS_OFFSET
-        else "SL=avg_price(break-even)" if SL_BREAKEVEN_MODE
-        else f"SL={STOP_LOSS}(fixed)"
-    )
+        # Unattended starts (no TTY) skip the prompt and its imports
+        interval = _prompt_interval() if sys.stdin.isatty() else DEFAULT_INTERVAL
 
     log.info("=" * 60)
     log.info("SOL DCA Snipe starting")
     log.info(f"  Interval : {interval.upper()}")
-    log.info(f"  ENTRY={ENTRY_PRICE}  BET=${AMOUNT_PER_BET}  TP={TAKE_PROFIT}")
-    log.info(f"  {sl_cfg}  BET_STEP={BET_STEP}")
-    log.info(f"  BUY={BUY_ORDER_TYPE}  SELL={SELL_ORDER_TYPE}  AUTO_BRACKETS={'ON' if AUTOSET_UP_TP_SL_ORDERS else 'OFF'}")
+    log.info(f"  {_ENTRY_CFG}")
+    log.info(f"  {_SL_CFG}  BET_STEP={BET_STEP}")
+    log.info(f"  {_ORDER_CFG}")
     log.info("=" * 60)
 
     client   = build_clob_client()
     executor = OrderExecutor(client=client, log=log)
     log.info("CLOB client authenticated OK")
 
+    next_mkt: Optional[Future] = None
     while True:
         state  = BotState()
-        market = wait_for_active_market(interval)
-        run_window(market, executor, state, interval)
+        market = next_mkt.result() if next_mkt is not None else None
+        if market is None:
+            market = wait_for_active_market(interval)
+        if market is None:
+            break
+        next_mkt = run_window(market, executor, state, interval)
 
         end_time  = get_market_end_time(market)
         wait_secs = 30
         if end_time:
-            remaining = (end_time - datetime.now(timezone.utc)).total_seconds()
-            wait_secs = max(5, remaining + 5)
+            wait_secs = max(5, end_time.timestamp() - time.time() + 5)
+            if next_mkt is None:   # window left early — look ahead from here
+                next_mkt = _PREFETCH_POOL.submit(_prefetch_next_market, interval, end_time.timestamp(), client)
         log.info(f"Waiting {wait_secs:.0f}s for next window ...")
-        time.sleep(wait_secs)
+        if _shutdown.wait(wait_secs):
+            break
+
+    log.info("Shutdown requested — bot stopped.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="SOL DCA Snipe")
+    parser.add_argument("--interval", choices=list(WINDOW_SECONDS), default=None,
+                        help=f"Market interval (prompted on a TTY, else {DEFAULT_INTERVAL})")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    args = parse_args()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop())
+    run(args.interval)
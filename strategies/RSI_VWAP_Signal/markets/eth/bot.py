@@ -69,12 +69,20 @@ import sys
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
 
+# orjson parses the raw response bytes several times faster than stdlib json;
+# stdlib json.loads also accepts bytes, so it is a drop-in fallback.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 # ── Path resolution ──────────────────────────────────────────────────────────
 # Dynamically finds project root and signal_engine.py regardless of
 # where the project lives on disk or how deep the folder structure is.
@@ -159,6 +167,14 @@ CLOB_HOST = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
 CHAIN_ID  = 137
 
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled keep-alive session for every REST call (market discovery, REST
+# midpoint fallback) so each request skips a fresh TLS handshake.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+for _host in (CLOB_HOST, GAMMA_API):
+    _SESSION.mount(_host, _ADAPTER)
+
 SLUG_TEMPLATES = {
     "5m" : "eth-updown-5m-{ts}",
     "15m": "eth-updown-15m-{ts}",
@@ -205,9 +221,9 @@ def get_current_window_timestamp(interval: str) -> int:
 
 def fetch_market(slug: str) -> Optional[dict]:
     try:
-        resp = requests.get(f"{GAMMA_API}/markets", params={"slug": slug}, timeout=10)
+        resp = _SESSION.get(f"{GAMMA_API}/markets", params={"slug": slug}, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json_loads(resp.content)
         if isinstance(data, list) and data:
             return data[0]
         if isinstance(data, dict) and data.get("slug") == slug:
@@ -234,31 +250,43 @@ def wait_for_active_market(interval: str) -> dict:
 
 
 def parse_market_tokens(market: dict) -> dict:
-    import json as _json
+    # Parsed once per market dict — later calls reuse the stashed result
+    cached = market.get("_parsed_tokens")
+    if cached is not None:
+        return cached
+
     outcomes = market.get("outcomes",      "[]")
     prices   = market.get("outcomePrices", "[0.5,0.5]")
     tokens   = market.get("clobTokenIds") or market.get("clob_token_ids", "[]")
 
-    outcomes = _json.loads(outcomes) if isinstance(outcomes, str) else outcomes
-    prices   = [float(p) for p in (_json.loads(prices) if isinstance(prices, str) else prices)]
-    tokens   = _json.loads(tokens)   if isinstance(tokens, str) else tokens
+    outcomes = _json_loads(outcomes) if isinstance(outcomes, str) else outcomes
+    prices   = [float(p) for p in (_json_loads(prices) if isinstance(prices, str) else prices)]
+    tokens   = _json_loads(tokens)   if isinstance(tokens, str) else tokens
 
     result = {}
     for i, name in enumerate(outcomes):
         key = "UP" if name.lower() in ("up", "yes") else "DOWN"
         result[key] = {"token_id": tokens[i], "price": prices[i]}
+    market["_parsed_tokens"] = result
     return result
 
 
 def get_market_end_time(market: dict) -> Optional[datetime]:
+    # Parsed once per market dict (run_window and run() both ask for it)
+    if "_end_time" in market:
+        return market["_end_time"]
+
+    end_time = None
     for field in ("endDate", "end_date_iso", "closedTime"):
         val = market.get(field)
         if val:
             try:
-                return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                end_time = datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                break
             except Exception:
                 continue
-    return None
+    market["_end_time"] = end_time
+    return end_time
 
 
 def get_tick_size_rest(client, token_id: str) -> float:
@@ -274,11 +302,11 @@ def get_tick_size_rest(client, token_id: str) -> float:
 
 def fetch_midpoint_rest(token_id: str) -> Optional[float]:
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             f"{CLOB_HOST}/midpoint", params={"token_id": token_id}, timeout=5
         )
         resp.raise_for_status()
-        return float(resp.json()["mid"])
+        return float(_json_loads(resp.content)["mid"])
     except Exception:
         return None
 
@@ -340,6 +368,29 @@ class BotState:
 #  MAIN WINDOW LOOP
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _side_status(signal: Optional[Signal], bought: bool, price: float, direction: str) -> str:
+    """Heartbeat status tag for one side."""
+    if bought: return "✔ bought"
+    if signal is None: return "no signal"
+    if signal.direction == direction:
+        in_range = PRICE_RANGE[0] <= price <= PRICE_RANGE[1]
+        conf_ok  = signal.confidence >= MIN_CONFIDENCE
+        if in_range and conf_ok:
+            return f"READY conf={signal.confidence:.2f}"
+        elif not in_range:
+            return f"out of range ({price:.4f})"
+        else:
+            return f"low conf ({signal.confidence:.2f})"
+    return f"signal={signal.direction}"
+
+
+def _signal_label(signal: Optional[Signal]) -> str:
+    if signal is None:
+        return "RSI=warming  VWAP=warming  sig=NEUTRAL "
+    return (f"RSI={signal.rsi:.1f}  VWAP={signal.vwap:.4f}  "
+            f"sig={signal.direction} conf={signal.confidence:.2f}")
+
+
 def run_window(
     market   : dict,
     executor : OrderExecutor,
@@ -373,18 +424,25 @@ def run_window(
     else:
         log.warning(f"[Poly WSS] Not ready after {WSS_READY_TIMEOUT}s — using REST")
 
+    # Countdown on the monotonic clock — no datetime allocation per tick
+    end_mono = (time.monotonic() + (end_time - datetime.now(timezone.utc)).total_seconds()
+                if end_time else None)
+    # Per-tick heartbeat lines are only formatted when INFO is actually emitted
+    log_ticks = log.isEnabledFor(logging.INFO)
+
     try:
         while True:
-            now = datetime.now(timezone.utc)
-            if end_time and now >= end_time:
+            now_m = time.monotonic()
+            if end_mono is not None and now_m >= end_mono:
                 log.info("Window closed.")
                 break
 
-            time_left  = (end_time - now).total_seconds() if end_time else 999
+            time_left  = end_mono - now_m if end_mono is not None else 999
             mins, secs = divmod(int(time_left), 60)
 
             if state.bought_up and state.bought_down:
-                log.info(f"[{mins:02d}:{secs:02d}]  Both sides bought — waiting for window close.")
+                if log_ticks:
+                    log.info(f"[{mins:02d}:{secs:02d}]  Both sides bought — waiting for window close.")
                 time.sleep(POLL_INTERVAL)
                 continue
 
@@ -400,32 +458,13 @@ def run_window(
                 time.sleep(POLL_INTERVAL)
                 continue
 
-            # Build status string for each side
-            def _status(bought, price, direction):
-                if bought: return "✔ bought"
-                if signal is None: return "no signal"
-                if signal.direction == direction:
-                    in_range = range_low <= price <= range_high
-                    conf_ok  = signal.confidence >= MIN_CONFIDENCE
-                    if in_range and conf_ok:
-                        return f"READY conf={signal.confidence:.2f}"
-                    elif not in_range:
-                        return f"out of range ({price:.4f})"
-                    else:
-                        return f"low conf ({signal.confidence:.2f})"
-                return f"signal={signal.direction if signal else 'none'}"
-
-            rsi_str  = f"RSI={signal.rsi:.1f}" if signal else "RSI=warming"
-            vwap_str = f"VWAP={signal.vwap:.4f}" if signal else "VWAP=warming"
-            sig_str  = signal.direction if signal else "NEUTRAL"
-            conf_str = f"conf={signal.confidence:.2f}" if signal else ""
-
-            log.info(
-                f"[{mins:02d}:{secs:02d}]  "
-                f"UP={up_price:.4f}[{_status(state.bought_up, up_price, 'UP')}]  "
-                f"DOWN={down_price:.4f}[{_status(state.bought_down, down_price, 'DOWN')}]  "
-                f"{rsi_str}  {vwap_str}  sig={sig_str} {conf_str}"
-            )
+            if log_ticks:
+                log.info(
+                    f"[{mins:02d}:{secs:02d}]  "
+                    f"UP={up_price:.4f}[{_side_status(signal, state.bought_up, up_price, 'UP')}]  "
+                    f"DOWN={down_price:.4f}[{_side_status(signal, state.bought_down, down_price, 'DOWN')}]  "
+                    f"{_signal_label(signal)}"
+                )
 
             # ── Entry logic ────────────────────────────────────────────────
             if signal and signal.is_actionable and signal.confidence >= MIN_CONFIDENCE:
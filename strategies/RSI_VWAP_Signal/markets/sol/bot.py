@@ -99,6 +99,7 @@ import sys
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from decimal import Decimal, ROUND_DOWN
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -106,6 +107,13 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
+# orjson parsea los bytes de la respuesta varias veces más rápido que json;
+# json.loads de stdlib también acepta bytes, así que sirve de fallback.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 
 # ── Path resolution ───────────────────────────────────────────────────────────
 def _find_dir_with(marker: str) -> Path:
@@ -213,6 +221,14 @@ GAMMA_API = "https://gamma-api.polymarket.com"
 DATA_API  = "https://data-api.polymarket.com"
 CHAIN_ID  = 137
 
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled keep-alive session for every REST call (market discovery, REST
+# midpoint fallback, position checks) so each request skips a fresh TLS handshake.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+for _host in (CLOB_HOST, GAMMA_API, DATA_API):
+    _SESSION.mount(_host, _ADAPTER)
+
 WINDOW_SECONDS = {"5m": 300, "15m": 900, "1h": 3600}
 
 
@@ -322,9 +338,9 @@ def _build_1h_event_slug(dt_utc: datetime) -> str:
 
 def _gamma_get(endpoint: str, params: dict) -> Optional[object]:
     try:
-        r = requests.get(f"{GAMMA_API}/{endpoint}", params=params, timeout=10)
+        r = _SESSION.get(f"{GAMMA_API}/{endpoint}", params=params, timeout=10)
         r.raise_for_status()
-        return r.json()
+        return _json_loads(r.content)
     except Exception as exc:
         log.warning(f"Gamma API {endpoint}: {exc}")
         return None
@@ -379,30 +395,44 @@ def wait_for_active_market(interval: str) -> dict:
         time.sleep(20)
 
 def parse_market_tokens(market: dict) -> dict:
-    import json as _j
-    outcomes = market.get("outcomes", "[]")
+    # Parsed once per market dict — later calls reuse the stashed result
+    cached = market.get("_parsed_tokens")
+    if cached is not None:
+        return cached
+
+    outcomes = market.get("outcomes",      "[]")
     prices   = market.get("outcomePrices", "[0.5,0.5]")
     tokens   = market.get("clobTokenIds") or market.get("clob_token_ids", "[]")
-    outcomes = _j.loads(outcomes) if isinstance(outcomes, str) else outcomes
-    prices   = [float(p) for p in (_j.loads(prices) if isinstance(prices, str) else prices)]
-    tokens   = _j.loads(tokens)   if isinstance(tokens, str) else tokens
-    result   = {}
+
+    outcomes = _json_loads(outcomes) if isinstance(outcomes, str) else outcomes
+    prices   = [float(p) for p in (_json_loads(prices) if isinstance(prices, str) else prices)]
+    tokens   = _json_loads(tokens)   if isinstance(tokens, str) else tokens
+
+    result = {}
     for i, name in enumerate(outcomes):
         key = "UP" if name.lower() in ("up", "yes") else "DOWN"
         result[key] = {"token_id": tokens[i], "price": prices[i]}
+    market["_parsed_tokens"] = result
     return result
 
+
 def get_market_end_time(market: dict) -> Optional[datetime]:
-    for f in ("endDate", "end_date_iso", "closedTime"):
-        val = market.get(f)
+    # Parsed once per market dict (run_window and run() both ask for it)
+    if "_end_time" in market:
+        return market["_end_time"]
+
+    end_time = None
+    for field in ("endDate", "end_date_iso", "closedTime"):
+        val = market.get(field)
         if val:
             try:
-                return datetime.fromisoformat(
-                    val.replace("Z", "+00:00")
-                ).astimezone(timezone.utc)
+                end_time = datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                break
             except Exception:
-                pass
-    return None
+                continue
+    market["_end_time"] = end_time
+    return end_time
+
 
 def get_tick_size_rest(client, token_id: str) -> float:
     try:
@@ -418,12 +448,12 @@ def get_tick_size_rest(client, token_id: str) -> float:
 
 def _rest_mid(token_id: str) -> Optional[float]:
     try:
-        r = requests.get(
+        r = _SESSION.get(
             f"{CLOB_HOST}/midpoint",
             params={"token_id": token_id}, timeout=5
         )
         r.raise_for_status()
-        return float(r.json()["mid"])
+        return float(_json_loads(r.content)["mid"])
     except Exception:
         return None
 
@@ -451,40 +481,42 @@ def get_real_position(token_id: str, condition_id: Optional[str] = None) -> Opti
 
     if condition_id:
         try:
-            r = requests.get(
+            r = _SESSION.get(
                 f"{DATA_API}/positions",
                 params={"user": owner, "sizeThreshold": "0.01",
                         "market": condition_id, "limit": "200"},
                 timeout=8,
             )
             r.raise_for_status()
-            result = _parse(r.json() if isinstance(r.json(), list) else [])
+            data   = _json_loads(r.content)
+            result = _parse(data if isinstance(data, list) else [])
             if result is not None:
                 return result
         except Exception as exc:
             log.warning(f"[pos] Data API (filtro): {exc}")
 
     try:
-        r = requests.get(
+        r = _SESSION.get(
             f"{DATA_API}/positions",
             params={"user": owner, "sizeThreshold": "0.01", "limit": "200"},
             timeout=8,
         )
         r.raise_for_status()
-        result = _parse(r.json() if isinstance(r.json(), list) else [])
+        data   = _json_loads(r.content)
+        result = _parse(data if isinstance(data, list) else [])
         return result if result is not None else 0.0
     except Exception as exc:
         log.warning(f"[pos] Data API (global): {exc}")
 
     try:
-        r = requests.get(
+        r = _SESSION.get(
             f"{CLOB_HOST}/balance-allowance",
             params={"asset_type": "CONDITIONAL_TOKEN",
                     "token_id": token_id, "owner": owner},
             timeout=5,
         )
         r.raise_for_status()
-        bal = float(r.json().get("balance", 0) or 0)
+        bal = float(_json_loads(r.content).get("balance", 0) or 0)
         return float(Decimal(str(bal)).quantize(Decimal("0.0001"), rounding=ROUND_DOWN))
     except Exception as exc:
         log.warning(f"[pos] CLOB balance-allowance: {exc}")
@@ -746,15 +778,21 @@ def run_window(
 
     _tick_ctr = 0
 
+    # Countdown on the monotonic clock — no datetime allocation per tick
+    end_mono = (time.monotonic() + (end_time - datetime.now(timezone.utc)).total_seconds()
+                if end_time else None)
+    # Las líneas de estado por tick solo se formatean si INFO está activo
+    log_ticks = log.isEnabledFor(logging.INFO)
+
     try:
         while True:
-            now = datetime.now(timezone.utc)
-            if end_time and now >= end_time:
+            now_m = time.monotonic()
+            if end_mono is not None and now_m >= end_mono:
                 log.info("Ventana cerrada — cancelando órdenes abiertas.")
                 executor.gtc_tracker.cancel_all(log)
                 break
 
-            time_left  = (end_time - now).total_seconds() if end_time else 9999
+            time_left  = end_mono - now_m if end_mono is not None else 9999
             mins, secs = divmod(int(time_left), 60)
             zone_label = rm.zone_label()
 
@@ -779,21 +817,22 @@ def run_window(
                 zone      = rm.get_zone()
 
                 # Log de estado
-                if signal:
-                    rsi_s  = f"RSI={signal.rsi:.1f}"
-                    sig_s  = f"sig={signal.direction}"
-                    con_s  = f"conf={signal.confidence:.2f}"
-                    con2_s = f"cons={signal.consensus_count}/{signal.sources_checked}"
-                    cl_s   = (f"CL={signal.chainlink_direction}"
-                              if signal.chainlink_available else "CL=off")
-                else:
-                    rsi_s = sig_s = con_s = con2_s = cl_s = "warming"
-
-                log.info(
-                    f"[{mins:02d}:{secs:02d}] [{zone_label}]  "
-                    f"UP={up_price:.4f}  DOWN={down_price:.4f}  "
-                    f"{rsi_s}  {sig_s}  {con_s}  {con2_s}  {cl_s}"
-                )
+                if log_ticks:
+                    if signal:
+                        rsi_s  = f"RSI={signal.rsi:.1f}"
+                        sig_s  = f"sig={signal.direction}"
+                        con_s  = f"conf={signal.confidence:.2f}"
+                        con2_s = f"cons={signal.consensus_count}/{signal.sources_checked}"
+                        cl_s   = (f"CL={signal.chainlink_direction}"
+                                  if signal.chainlink_available else "CL=off")
+                    else:
+                        rsi_s = sig_s = con_s = con2_s = cl_s = "warming"
+
+                    log.info(
+                        f"[{mins:02d}:{secs:02d}] [{zone_label}]  "
+                        f"UP={up_price:.4f}  DOWN={down_price:.4f}  "
+                        f"{rsi_s}  {sig_s}  {con_s}  {con2_s}  {cl_s}"
+                    )
 
                 if not can_enter:
                     if zone == WindowZone.LATE:
@@ -903,11 +942,12 @@ def run_window(
             #  FASE 2 — En posición → gestión de riesgo
             # ─────────────────────────────────────────────────────────────────
             else:
-                log.info(
-                    f"[{mins:02d}:{secs:02d}] Ambos lados comprados — "
-                    f"UP={up_price:.4f}  DOWN={down_price:.4f}  "
-                    f"[{zone_label}]"
-                )
+                if log_ticks:
+                    log.info(
+                        f"[{mins:02d}:{secs:02d}] Ambos lados comprados — "
+                        f"UP={up_price:.4f}  DOWN={down_price:.4f}  "
+                        f"[{zone_label}]"
+                    )
                 time.sleep(POLL_INTERVAL)
                 continue
 
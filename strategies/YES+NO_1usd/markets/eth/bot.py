@@ -34,13 +34,23 @@ import os
 import sys
 import time
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from dotenv import load_dotenv
 
+# orjson parses the raw response bytes several times faster than stdlib json;
+# stdlib json.loads also accepts bytes, so it is a drop-in fallback.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 _ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
 load_dotenv(_ROOT / ".env")
 
@@ -78,6 +88,9 @@ AMOUNT_TO_BUY     = float(os.getenv("ETH_AMOUNT_TO_BUY",  "1.0"))
 POLL_INTERVAL     = float(os.getenv("ETH_POLL_INTERVAL",   "0.5"))
 BUY_ORDER_TYPE    = (os.getenv("BUY_ORDER_TYPE") or "FAK").upper()
 WSS_READY_TIMEOUT = float(os.getenv("WSS_READY_TIMEOUT", "10.0"))
+MAX_TICKS_PER_SEC = 30   # bursts of WSS updates coalesce into at most this many passes/sec
+REST_REFRESH_SECS = 2.0  # background REST midpoint poll while WSS has no price
+REST_MAX_AGE_SECS = 6.0  # REST midpoints older than this are ignored
 
 CLOB_HOST = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
@@ -89,6 +102,20 @@ SLUG_TEMPLATES = {
 }
 WINDOW_SECONDS = {"5m": 300, "15m": 900}
 
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled keep-alive session for every REST call (Gamma discovery, REST
+# midpoint fallback) so each request skips a fresh TLS handshake. Transient
+# connection failures get two quick retries.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+))
+
+# Gamma lookups (hits and misses) are reused for SLUG_CACHE_TTL seconds.
+SLUG_CACHE_TTL = 10.0
+_slug_cache: Dict[str, tuple] = {}   # slug → (monotonic fetch time, market | None)
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  CLOB CLIENT
@@ -127,18 +154,49 @@ def get_current_window_timestamp(interval: str) -> int:
     return (int(datetime.now(timezone.utc).timestamp()) // window) * window
 
 
-def fetch_market(slug: str) -> Optional[dict]:
+def fetch_markets(slugs: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    Look up several slugs with a single Gamma request.
+    Returns {slug: market | None}; fresh cache entries skip the network.
+    """
+    now     = time.monotonic()
+    found   = {}
+    missing = []
+    for slug in slugs:
+        hit = _slug_cache.get(slug)
+        if hit and now - hit[0] < SLUG_CACHE_TTL:
+            found[slug] = hit[1]
+        else:
+            missing.append(slug)
+    if not missing:
+        return found
+
     try:
-        resp = requests.get(f"{GAMMA_API}/markets", params={"slug": slug}, timeout=10)
+        resp = _SESSION.get(
+            f"{GAMMA_API}/markets",
+            params=[("slug", slug) for slug in missing],
+            timeout=10,
+        )
         resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, list) and data:
-            return data[0]
-        if isinstance(data, dict) and data.get("slug") == slug:
-            return data
+        data = _json_loads(resp.content)
     except Exception as exc:
-        log.warning(f"Gamma API error for {slug}: {exc}")
-    return None
+        log.warning(f"Gamma API error for {', '.join(missing)}: {exc}")
+        return found
+
+    if isinstance(data, dict):
+        data = [data]
+    by_slug = {m.get("slug"): m for m in data if isinstance(m, dict)} if isinstance(data, list) else {}
+
+    for slug in [s for s, (ts, _) in _slug_cache.items() if now - ts >= SLUG_CACHE_TTL]:
+        del _slug_cache[slug]
+    for slug in missing:
+        found[slug]       = by_slug.get(slug)
+        _slug_cache[slug] = (now, found[slug])
+    return found
+
+
+def fetch_market(slug: str) -> Optional[dict]:
+    return fetch_markets((slug,)).get(slug)
 
 
 def wait_for_active_market(interval: str) -> dict:
@@ -146,10 +204,11 @@ def wait_for_active_market(interval: str) -> dict:
     window   = WINDOW_SECONDS[interval]
     log.info(f"Searching for active ETH {interval.upper()} market ...")
     while True:
-        ts = get_current_window_timestamp(interval)
-        for candidate in [ts, ts + window]:
-            slug   = template.format(ts=candidate)
-            market = fetch_market(slug)
+        ts      = get_current_window_timestamp(interval)
+        slugs   = [template.format(ts=candidate) for candidate in (ts, ts + window)]
+        markets = fetch_markets(slugs)
+        for slug in slugs:
+            market = markets.get(slug)
             if market and market.get("active") and not market.get("closed"):
                 log.info(f"Found market: {slug}")
                 log.info(f"  End date : {market.get('endDate') or market.get('end_date_iso')}")
@@ -158,35 +217,53 @@ def wait_for_active_market(interval: str) -> dict:
         time.sleep(15)
 
 
+# Outcome names that map to the UP side; anything else is DOWN
+_UP_NAMES = frozenset(("up", "yes"))
+
+
 def parse_market_tokens(market: dict) -> dict:
-    import json
+    # Parsed once per market dict — the token layout never changes
+    cached = market.get("_parsed_tokens")
+    if cached is not None:
+        return cached
+
     outcomes = market.get("outcomes",      "[]")
     prices   = market.get("outcomePrices", "[0.5,0.5]")
     tokens   = market.get("clobTokenIds") or market.get("clob_token_ids", "[]")
 
-    outcomes = json.loads(outcomes) if isinstance(outcomes, str) else outcomes
-    prices   = [float(p) for p in (json.loads(prices) if isinstance(prices, str) else prices)]
-    tokens   = json.loads(tokens)   if isinstance(tokens, str) else tokens
+    outcomes = _json_loads(outcomes) if isinstance(outcomes, str) else outcomes
+    prices   = list(map(float, _json_loads(prices) if isinstance(prices, str) else prices))
+    tokens   = _json_loads(tokens)   if isinstance(tokens, str) else tokens
 
-    result = {}
-    for i, name in enumerate(outcomes):
-        key = "UP" if name.lower() in ("up", "yes") else "DOWN"
-        result[key] = {
+    result = {
+        "UP" if name.lower() in _UP_NAMES else "DOWN": {
             "token_id": tokens[i] if i < len(tokens) else None,
             "price":    prices[i] if i < len(prices) else 0.5,
         }
+        for i, name in enumerate(outcomes)
+    }
+    market["_parsed_tokens"] = result
     return result
 
 
 def get_market_end_time(market: dict) -> Optional[datetime]:
+    # Parsed once per market dict (run_window and run() both ask for it)
+    if "_end_time" in market:
+        return market["_end_time"]
+
+    end_time = None
     for field in ("endDate", "end_date_iso", "closedTime"):
         val = market.get(field)
         if val:
+            if val.endswith("Z"):
+                val = val[:-1] + "+00:00"
             try:
-                return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                end_time = datetime.fromisoformat(val).astimezone(timezone.utc)
+                break
             except Exception:
                 continue
-    return None
+    market["_end_time"] = end_time
+    return end_time
 
 
 def get_tick_size_rest(client, token_id: str) -> float:
@@ -203,20 +280,44 @@ def get_tick_size_rest(client, token_id: str) -> float:
 
 def fetch_midpoint_rest(token_id: str) -> Optional[float]:
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             f"{CLOB_HOST}/midpoint", params={"token_id": token_id}, timeout=5
         )
         resp.raise_for_status()
-        return float(resp.json()["mid"])
+        return float(_json_loads(resp.content)["mid"])
     except Exception:
         return None
 
 
-def get_prices(stream: MarketStream, token_up: str, token_down: str) -> Optional[dict]:
+def _rest_refresher(stream: MarketStream, token_ids, cache: dict, stop: threading.Event):
+    """
+    Background REST poll for tokens the WSS has no midpoint for yet.
+    Fills cache[token_id] = (mid, monotonic time) every REST_REFRESH_SECS so
+    the tick loop never waits on an HTTP round-trip.
+    """
+    while not stop.is_set():
+        for token_id in token_ids:
+            if stream.get_midpoint(token_id) is None:
+                mid = fetch_midpoint_rest(token_id)
+                if mid is not None:
+                    cache[token_id] = (mid, time.monotonic())
+                    stream.wake()
+        stop.wait(REST_REFRESH_SECS)
+
+
+def _cached_rest_mid(cache: dict, token_id: str) -> Optional[float]:
+    hit = cache.get(token_id)
+    if hit and time.monotonic() - hit[1] < REST_MAX_AGE_SECS:
+        return hit[0]
+    return None
+
+
+def get_prices(stream: MarketStream, token_up: str, token_down: str, rest_mids: dict) -> Optional[dict]:
+    """WSS midpoints, else a fresh REST value from _rest_refresher. Never blocks."""
     up_price   = stream.get_midpoint(token_up)
     down_price = stream.get_midpoint(token_down)
-    if up_price is None:   up_price   = fetch_midpoint_rest(token_up)
-    if down_price is None: down_price = fetch_midpoint_rest(token_down)
+    if up_price is None:   up_price   = _cached_rest_mid(rest_mids, token_up)
+    if down_price is None: down_price = _cached_rest_mid(rest_mids, token_down)
     if up_price is None or down_price is None:
         return None
     return {"UP": up_price, "DOWN": down_price}
@@ -242,6 +343,9 @@ class BotState:
         # Loss prevention: tracks which side was bought via TRIGGER_RANGE
         # so the bot knows to wait for PRICE_RANGE on the OPPOSITE side only
         self.trigger_side   : Optional[str] = None  # "UP" | "DOWN" | None
+        # summary() text cache — only re-formatted after a fill changes the state
+        self._summary_key   : Optional[tuple] = None
+        self._summary_text  : str             = ""
 
     @property
     def both_bought(self) -> bool:
@@ -256,6 +360,16 @@ class BotState:
         return self.up_price + self.down_price
 
     def summary(self) -> str:
+        key = (
+            self.bought_up, self.bought_down, self.up_shares, self.down_shares,
+            self.up_cost, self.down_cost, self.up_price, self.down_price, self.trigger_side,
+        )
+        if key != self._summary_key:
+            self._summary_key  = key
+            self._summary_text = self._format_summary()
+        return self._summary_text
+
+    def _format_summary(self) -> str:
         lines = ["YES+NO position summary:"]
         if self.bought_up:
             tag = " [trigger]" if self.trigger_side == "UP" else ""
@@ -330,9 +444,29 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
     log.info("=" * 60)
 
     log.info("[WSS] Opening market channel ...")
-    stream = MarketStream(asset_ids=[token_up, token_down])
+    # Tick sizes only change on a WSS tick_size_change event, so keep them in
+    # locals refreshed by the stream instead of re-reading them every tick.
+    def _on_tick_size_change(token_id: str, tick_size: float):
+        nonlocal tick_up, tick_down
+        if token_id == token_up:
+            tick_up = tick_size
+        elif token_id == token_down:
+            tick_down = tick_size
+
+    stream = MarketStream(
+        asset_ids           = [token_up, token_down],
+        on_tick_size_change = _on_tick_size_change,
+    )
     stream.start()
 
+    # REST fallback runs off the tick loop; get_prices only reads its cache
+    rest_mids = {}
+    rest_stop = threading.Event()
+    threading.Thread(
+        target=_rest_refresher, args=(stream, (token_up, token_down), rest_mids, rest_stop),
+        daemon=True, name="RestMidpoints",
+    ).start()
+
     ready = stream.wait_ready(timeout=WSS_READY_TIMEOUT)
     if ready:
         ts_up   = stream.get_tick_size(token_up)
@@ -347,25 +481,44 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
     else:
         log.warning(f"[WSS] Not ready after {WSS_READY_TIMEOUT}s — using REST fallback")
 
+    # Per-tick heartbeat lines are only formatted when INFO is actually emitted
+    log_ticks = log.isEnabledFor(logging.INFO)
+
+    # ── Status labels for tick display ─────────────────────────────────────
+    def _status(bought, in_range, in_trigger, is_trigger_side_active):
+        if bought:
+            return "✔ bought"
+        if LOSS_PREVENTION and is_trigger_side_active:
+            # After first-side trigger buy, opposite side waits for PRICE_RANGE
+            return "IN RANGE" if in_range else "waiting→PR"
+        if LOSS_PREVENTION and not state.trigger_side:
+            # No side bought yet — both watching TRIGGER_RANGE
+            return "IN TRIGGER" if in_trigger else "waiting→TR"
+        # Standard mode
+        return "IN RANGE" if in_range else "waiting"
+
+    # Count down on the monotonic clock instead of building a tz-aware
+    # datetime every tick
+    end_mono = None
+    if end_time:
+        end_mono = time.monotonic() + (end_time - datetime.now(timezone.utc)).total_seconds()
+
     try:
         while True:
-            now = datetime.now(timezone.utc)
-            if end_time and now >= end_time:
+            time_left = end_mono - time.monotonic() if end_mono is not None else 999
+            if time_left <= 0:
                 log.info("Window closed.")
                 break
 
-            time_left  = (end_time - now).total_seconds() if end_time else 999
             mins, secs = divmod(int(time_left), 60)
 
             if state.both_bought:
-                log.info(f"[{mins:02d}:{secs:02d}]  Both sides purchased — waiting for window close.")
+                if log_ticks:
+                    log.info(f"[{mins:02d}:{secs:02d}]  Both sides purchased — waiting for window close.")
                 time.sleep(POLL_INTERVAL)
                 continue
 
-            tick_up   = stream.get_tick_size(token_up)
-            tick_down = stream.get_tick_size(token_down)
-
-            prices = get_prices(stream, token_up, token_down)
+            prices = get_prices(stream, token_up, token_down, rest_mids)
             if prices is None:
                 log.warning("Price fetch failed — skipping tick")
                 time.sleep(POLL_INTERVAL)
@@ -376,30 +529,25 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
             combined   = up_price + down_price
             src        = "WSS" if stream.is_connected else "REST"
 
-            # ── Status labels for tick display ─────────────────────────────
-            def _status(bought, price, is_trigger_side_active):
-                if bought:
-                    return "✔ bought"
-                if LOSS_PREVENTION and is_trigger_side_active:
-                    # After first-side trigger buy, opposite side waits for PRICE_RANGE
-                    return "IN RANGE" if range_low <= price <= range_high else "waiting→PR"
-                if LOSS_PREVENTION and not state.trigger_side:
-                    # No side bought yet — both watching TRIGGER_RANGE
-                    return "IN TRIGGER" if trigger_low <= price <= trigger_high else "waiting→TR"
-                # Standard mode
-                return "IN RANGE" if range_low <= price <= range_high else "waiting"
-
-            up_in_trigger_active   = state.trigger_side == "DOWN"  # UP is the "opposite" side
-            down_in_trigger_active = state.trigger_side == "UP"    # DOWN is the "opposite" side
-            up_status   = _status(state.bought_up,   up_price,   up_in_trigger_active)
-            down_status = _status(state.bought_down, down_price, down_in_trigger_active)
-
-            log.info(
-                f"[{mins:02d}:{secs:02d}]  "
-                f"UP={up_price:.4f}[{up_status}]  "
-                f"DOWN={down_price:.4f}[{down_status}]  "
-                f"combined={combined:.4f}  {src}"
-            )
+            # Range checks are evaluated once per tick and shared by the
+            # status labels and the buy logic below
+            in_up        = range_low   <= up_price   <= range_high
+            in_down      = range_low   <= down_price <= range_high
+            in_trig_up   = trigger_low <= up_price   <= trigger_high
+            in_trig_down = trigger_low <= down_price <= trigger_high
+
+            if log_ticks:
+                up_in_trigger_active   = state.trigger_side == "DOWN"  # UP is the "opposite" side
+                down_in_trigger_active = state.trigger_side == "UP"    # DOWN is the "opposite" side
+                up_status   = _status(state.bought_up,   in_up,   in_trig_up,   up_in_trigger_active)
+                down_status = _status(state.bought_down, in_down, in_trig_down, down_in_trigger_active)
+
+                log.info(
+                    f"[{mins:02d}:{secs:02d}]  "
+                    f"UP={up_price:.4f}[{up_status}]  "
+                    f"DOWN={down_price:.4f}[{down_status}]  "
+                    f"combined={combined:.4f}  {src}"
+                )
 
             # ══════════════════════════════════════════════════════════════
             #  BUY LOGIC
@@ -407,7 +555,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
             if not LOSS_PREVENTION:
                 # ── Standard mode: both sides use PRICE_RANGE ─────────────
-                if not state.bought_up and range_low <= up_price <= range_high:
+                if not state.bought_up and in_up:
                     shares, cost = _execute_buy(executor, token_up, up_price, tick_up, "UP")
                     if shares:
                         state.bought_up = True
@@ -415,7 +563,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                         state.up_cost   = cost
                         state.up_price  = up_price
 
-                if not state.bought_down and range_low <= down_price <= range_high:
+                if not state.bought_down and in_down:
                     shares, cost = _execute_buy(executor, token_down, down_price, tick_down, "DOWN")
                     if shares:
                         state.bought_down = True
@@ -436,7 +584,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
                 if not state.bought_up and not state.bought_down:
                     # Phase 1: neither side bought — watch TRIGGER_RANGE on both
-                    if trigger_low <= up_price <= trigger_high:
+                    if in_trig_up:
                         log.info(f"  [LP] UP hit TRIGGER_RANGE {trigger_low:.2f}–{trigger_high:.2f}")
                         shares, cost = _execute_buy(executor, token_up, up_price, tick_up, "UP [trigger]")
                         if shares:
@@ -447,7 +595,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                             state.trigger_side = "UP"
                             log.info(f"  [LP] Now waiting for DOWN to enter PRICE_RANGE {range_low:.2f}–{range_high:.2f}")
 
-                    elif trigger_low <= down_price <= trigger_high:
+                    elif in_trig_down:
                         log.info(f"  [LP] DOWN hit TRIGGER_RANGE {trigger_low:.2f}–{trigger_high:.2f}")
                         shares, cost = _execute_buy(executor, token_down, down_price, tick_down, "DOWN [trigger]")
                         if shares:
@@ -460,7 +608,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
                 elif state.trigger_side == "UP" and not state.bought_down:
                     # Phase 2: UP was bought via trigger — wait for DOWN in PRICE_RANGE
-                    if range_low <= down_price <= range_high:
+                    if in_down:
                         shares, cost = _execute_buy(executor, token_down, down_price, tick_down, "DOWN [LP second]")
                         if shares:
                             state.bought_down = True
@@ -470,7 +618,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
                 elif state.trigger_side == "DOWN" and not state.bought_up:
                     # Phase 2: DOWN was bought via trigger — wait for UP in PRICE_RANGE
-                    if range_low <= up_price <= range_high:
+                    if in_up:
                         shares, cost = _execute_buy(executor, token_up, up_price, tick_up, "UP [LP second]")
                         if shares:
                             state.bought_up = True
@@ -478,12 +626,15 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                             state.up_cost   = cost
                             state.up_price  = up_price
 
-            if state.bought_up or state.bought_down:
+            if log_ticks and (state.bought_up or state.bought_down):
                 log.info(state.summary())
 
-            time.sleep(POLL_INTERVAL)
+            # Wake on the next WSS price update; POLL_INTERVAL caps the wait
+            # when the stream is quiet or down.
+            stream.wait_for_tick(POLL_INTERVAL, min_gap=1 / MAX_TICKS_PER_SEC)
 
     finally:
+        rest_stop.set()
         log.info("[WSS] Closing market channel.")
         stream.stop()
 
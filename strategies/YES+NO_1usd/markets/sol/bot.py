@@ -83,13 +83,23 @@ import os
 import sys
 import time
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from dotenv import load_dotenv
 
+# orjson parses the raw response bytes several times faster than stdlib json;
+# stdlib json.loads also accepts bytes, so it is a drop-in fallback.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 _ROOT = Path(__file__).resolve().parent.parent.parent.parent.parent
 load_dotenv(_ROOT / ".env")
 sys.path.insert(0, str(_ROOT))
@@ -130,6 +140,9 @@ AMOUNT_TO_BUY         = _float("SOL_AMOUNT_TO_BUY",         1.0)
 TRIGGER_PROFIT_MARGIN = _float("SOL_TRIGGER_PROFIT_MARGIN", 0.05)
 POLL_INTERVAL         = _float("SOL_POLL_INTERVAL",         0.5)
 WSS_READY_TIMEOUT     = _float("WSS_READY_TIMEOUT",                10.0)
+MAX_TICKS_PER_SEC     = 30   # bursts of WSS updates coalesce into at most this many passes/sec
+REST_REFRESH_SECS     = 2.0  # background REST midpoint poll while WSS has no price
+REST_MAX_AGE_SECS     = 6.0  # REST midpoints older than this are ignored
 
 # Order type — read from shared .env, used by OrderExecutor internally.
 # Supported: FAK (market fill), FOK (limit, full or cancel), GTC (rests in book).
@@ -146,6 +159,20 @@ SLUG_TEMPLATES = {
 }
 WINDOW_SECONDS = {"5m": 300, "15m": 900}
 
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled keep-alive session for every REST call (Gamma discovery, REST
+# midpoint fallback) so each request skips a fresh TLS handshake. Transient
+# connection failures get two quick retries.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+))
+
+# Gamma lookups (hits and misses) are reused for SLUG_CACHE_TTL seconds.
+SLUG_CACHE_TTL = 10.0
+_slug_cache: Dict[str, tuple] = {}   # slug → (monotonic fetch time, market | None)
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 #  TRIGGER AMOUNT CALCULATOR
@@ -219,18 +246,49 @@ def get_current_window_timestamp(interval: str) -> int:
     return (int(datetime.now(timezone.utc).timestamp()) // window) * window
 
 
-def fetch_market(slug: str) -> Optional[dict]:
+def fetch_markets(slugs: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """
+    Look up several slugs with a single Gamma request.
+    Returns {slug: market | None}; fresh cache entries skip the network.
+    """
+    now     = time.monotonic()
+    found   = {}
+    missing = []
+    for slug in slugs:
+        hit = _slug_cache.get(slug)
+        if hit and now - hit[0] < SLUG_CACHE_TTL:
+            found[slug] = hit[1]
+        else:
+            missing.append(slug)
+    if not missing:
+        return found
+
     try:
-        resp = requests.get(f"{GAMMA_API}/markets", params={"slug": slug}, timeout=10)
+        resp = _SESSION.get(
+            f"{GAMMA_API}/markets",
+            params=[("slug", slug) for slug in missing],
+            timeout=10,
+        )
         resp.raise_for_status()
-        data = resp.json()
-        if isinstance(data, list) and data:
-            return data[0]
-        if isinstance(data, dict) and data.get("slug") == slug:
-            return data
+        data = _json_loads(resp.content)
     except Exception as exc:
-        log.warning(f"Gamma API error for {slug}: {exc}")
-    return None
+        log.warning(f"Gamma API error for {', '.join(missing)}: {exc}")
+        return found
+
+    if isinstance(data, dict):
+        data = [data]
+    by_slug = {m.get("slug"): m for m in data if isinstance(m, dict)} if isinstance(data, list) else {}
+
+    for slug in [s for s, (ts, _) in _slug_cache.items() if now - ts >= SLUG_CACHE_TTL]:
+        del _slug_cache[slug]
+    for slug in missing:
+        found[slug]       = by_slug.get(slug)
+        _slug_cache[slug] = (now, found[slug])
+    return found
+
+
+def fetch_market(slug: str) -> Optional[dict]:
+    return fetch_markets((slug,)).get(slug)
 
 
 def wait_for_active_market(interval: str) -> dict:
@@ -238,10 +296,11 @@ def wait_for_active_market(interval: str) -> dict:
     window   = WINDOW_SECONDS[interval]
     log.info(f"Searching for active SOL {interval.upper()} market ...")
     while True:
-        ts = get_current_window_timestamp(interval)
-        for candidate in [ts, ts + window]:
-            slug   = template.format(ts=candidate)
-            market = fetch_market(slug)
+        ts      = get_current_window_timestamp(interval)
+        slugs   = [template.format(ts=candidate) for candidate in (ts, ts + window)]
+        markets = fetch_markets(slugs)
+        for slug in slugs:
+            market = markets.get(slug)
             if market and market.get("active") and not market.get("closed"):
                 log.info(f"Found market: {slug}")
                 return market
@@ -249,33 +308,53 @@ def wait_for_active_market(interval: str) -> dict:
         time.sleep(15)
 
 
+# Outcome names that map to the UP side; anything else is DOWN
+_UP_NAMES = frozenset(("up", "yes"))
+
+
 def parse_market_tokens(market: dict) -> dict:
-    import json as _json
+    # Parsed once per market dict — the token layout never changes
+    cached = market.get("_parsed_tokens")
+    if cached is not None:
+        return cached
+
     outcomes = market.get("outcomes",      "[]")
     prices   = market.get("outcomePrices", "[0.5,0.5]")
     tokens   = market.get("clobTokenIds") or market.get("clob_token_ids", "[]")
-    outcomes = _json.loads(outcomes) if isinstance(outcomes, str) else outcomes
-    prices   = [float(p) for p in (_json.loads(prices) if isinstance(prices, str) else prices)]
-    tokens   = _json.loads(tokens)   if isinstance(tokens, str) else tokens
-    result   = {}
-    for i, name in enumerate(outcomes):
-        key = "UP" if name.lower() in ("up", "yes") else "DOWN"
-        result[key] = {
+
+    outcomes = _json_loads(outcomes) if isinstance(outcomes, str) else outcomes
+    prices   = list(map(float, _json_loads(prices) if isinstance(prices, str) else prices))
+    tokens   = _json_loads(tokens)   if isinstance(tokens, str) else tokens
+
+    result = {
+        "UP" if name.lower() in _UP_NAMES else "DOWN": {
             "token_id": tokens[i] if i < len(tokens) else None,
             "price":    prices[i] if i < len(prices) else 0.5,
         }
+        for i, name in enumerate(outcomes)
+    }
+    market["_parsed_tokens"] = result
     return result
 
 
 def get_market_end_time(market: dict) -> Optional[datetime]:
+    # Parsed once per market dict (run_window and run() both ask for it)
+    if "_end_time" in market:
+        return market["_end_time"]
+
+    end_time = None
     for field in ("endDate", "end_date_iso", "closedTime"):
         val = market.get(field)
         if val:
+            if val.endswith("Z"):
+                val = val[:-1] + "+00:00"
             try:
-                return datetime.fromisoformat(val.replace("Z", "+00:00")).astimezone(timezone.utc)
+                end_time = datetime.fromisoformat(val).astimezone(timezone.utc)
+                break
             except Exception:
                 continue
-    return None
+    market["_end_time"] = end_time
+    return end_time
 
 
 def get_tick_size_rest(client, token_id: str) -> float:
@@ -292,21 +371,47 @@ def get_tick_size_rest(client, token_id: str) -> float:
 
 def fetch_midpoint_rest(token_id: str) -> Optional[float]:
     try:
-        resp = requests.get(
+        resp = _SESSION.get(
             f"{CLOB_HOST}/midpoint", params={"token_id": token_id}, timeout=5
         )
         resp.raise_for_status()
-        return float(resp.json()["mid"])
+        return float(_json_loads(resp.content)["mid"])
     except Exception:
         return None
 
 
-def get_prices(stream: MarketStream, token_up: str, token_down: str) -> Optional[dict]:
-    up   = stream.get_midpoint(token_up)   or fetch_midpoint_rest(token_up)
-    down = stream.get_midpoint(token_down) or fetch_midpoint_rest(token_down)
-    if up is None or down is None:
+def _rest_refresher(stream: MarketStream, token_ids, cache: dict, stop: threading.Event):
+    """
+    Background REST poll for tokens the WSS has no midpoint for yet.
+    Fills cache[token_id] = (mid, monotonic time) every REST_REFRESH_SECS so
+    the tick loop never waits on an HTTP round-trip.
+    """
+    while not stop.is_set():
+        for token_id in token_ids:
+            if stream.get_midpoint(token_id) is None:
+                mid = fetch_midpoint_rest(token_id)
+                if mid is not None:
+                    cache[token_id] = (mid, time.monotonic())
+                    stream.wake()
+        stop.wait(REST_REFRESH_SECS)
+
+
+def _cached_rest_mid(cache: dict, token_id: str) -> Optional[float]:
+    hit = cache.get(token_id)
+    if hit and time.monotonic() - hit[1] < REST_MAX_AGE_SECS:
+        return hit[0]
+    return None
+
+
+def get_prices(stream: MarketStream, token_up: str, token_down: str, rest_mids: dict) -> Optional[dict]:
+    """WSS midpoints, else a fresh REST value from _rest_refresher. Never blocks."""
+    up_price   = stream.get_midpoint(token_up)
+    down_price = stream.get_midpoint(token_down)
+    if up_price is None:   up_price   = _cached_rest_mid(rest_mids, token_up)
+    if down_price is None: down_price = _cached_rest_mid(rest_mids, token_down)
+    if up_price is None or down_price is None:
         return None
-    return {"UP": up, "DOWN": down}
+    return {"UP": up_price, "DOWN": down_price}
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -488,8 +593,28 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                  f"→ amount=${AMOUNT_TO_BUY:.2f} per side")
     log.info("=" * 60)
 
-    stream = MarketStream(asset_ids=[token_up, token_down])
+    # Tick sizes only change on a WSS tick_size_change event, so keep them in
+    # locals refreshed by the stream instead of re-reading them every tick.
+    def _on_tick_size_change(token_id: str, tick_size: float):
+        nonlocal tick_up, tick_down
+        if token_id == token_up:
+            tick_up = tick_size
+        elif token_id == token_down:
+            tick_down = tick_size
+
+    stream = MarketStream(
+        asset_ids           = [token_up, token_down],
+        on_tick_size_change = _on_tick_size_change,
+    )
     stream.start()
+
+    # REST fallback runs off the tick loop; get_prices only reads its cache
+    rest_mids = {}
+    rest_stop = threading.Event()
+    threading.Thread(
+        target=_rest_refresher, args=(stream, (token_up, token_down), rest_mids, rest_stop),
+        daemon=True, name="RestMidpoints",
+    ).start()
     ready = stream.wait_ready(timeout=WSS_READY_TIMEOUT)
     if ready:
         tick_up   = stream.get_tick_size(token_up)   or tick_up
@@ -504,25 +629,47 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
     else:
         log.warning(f"[WSS] Not ready after {WSS_READY_TIMEOUT}s — using REST")
 
+    # Per-tick heartbeat lines are only formatted when INFO is actually emitted
+    log_ticks = log.isEnabledFor(logging.INFO)
+
+    # ── Status labels ──────────────────────────────────────────────────────
+    def _label(bought, in_range, in_trigger, side):
+        if bought:
+            return "✔ bought"
+        if not LOSS_PREVENTION:
+            return f"IN_RANGE" if in_range else f"waiting  [{range_low:.2f}-{range_high:.2f}]"
+        # LP mode
+        if state.trigger_side is None:
+            # Phase 1: both sides watching TRIGGER_RANGE
+            return f"IN_TRIGGER" if in_trigger else f"waiting→TR[{trigger_low:.2f}-{trigger_high:.2f}]"
+        else:
+            # Phase 2: only the non-trigger side watching PRICE_RANGE
+            if state.trigger_side == side:
+                return "✔ trigger"  # already bought
+            return f"IN_RANGE" if in_range else f"waiting→PR[{range_low:.2f}-{range_high:.2f}]"
+
+    # Count down on the monotonic clock instead of building a tz-aware
+    # datetime every tick
+    end_mono = None
+    if end_time:
+        end_mono = time.monotonic() + (end_time - datetime.now(timezone.utc)).total_seconds()
+
     try:
         while True:
-            now = datetime.now(timezone.utc)
-            if end_time and now >= end_time:
+            time_left = end_mono - time.monotonic() if end_mono is not None else 999
+            if time_left <= 0:
                 log.info("Window closed.")
                 break
 
-            time_left  = (end_time - now).total_seconds() if end_time else 999
             mins, secs = divmod(int(time_left), 60)
 
             if state.both_bought:
-                log.info(f"[{mins:02d}:{secs:02d}]  Both sides filled — waiting for resolution.")
+                if log_ticks:
+                    log.info(f"[{mins:02d}:{secs:02d}]  Both sides filled — waiting for resolution.")
                 time.sleep(POLL_INTERVAL)
                 continue
 
-            tick_up   = stream.get_tick_size(token_up)   or tick_up
-            tick_down = stream.get_tick_size(token_down) or tick_down
-
-            prices = get_prices(stream, token_up, token_down)
+            prices = get_prices(stream, token_up, token_down, rest_mids)
             if prices is None:
                 log.warning("Price fetch failed — skipping tick")
                 time.sleep(POLL_INTERVAL)
@@ -532,28 +679,20 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
             down_price = prices["DOWN"]
             src        = "WSS" if stream.is_connected else "REST"
 
-            # ── Status labels ──────────────────────────────────────────────
-            def _label(bought, price, side):
-                if bought:
-                    return "✔ bought"
-                if not LOSS_PREVENTION:
-                    return f"IN_RANGE" if range_low <= price <= range_high else f"waiting  [{range_low:.2f}-{range_high:.2f}]"
-                # LP mode
-                if state.trigger_side is None:
-                    # Phase 1: both sides watching TRIGGER_RANGE
-                    return f"IN_TRIGGER" if trigger_low <= price <= trigger_high else f"waiting→TR[{trigger_low:.2f}-{trigger_high:.2f}]"
-                else:
-                    # Phase 2: only the non-trigger side watching PRICE_RANGE
-                    if state.trigger_side == side:
-                        return "✔ trigger"  # already bought
-                    return f"IN_RANGE" if range_low <= price <= range_high else f"waiting→PR[{range_low:.2f}-{range_high:.2f}]"
-
-            log.info(
-                f"[{mins:02d}:{secs:02d}]  "
-                f"UP={up_price:.4f}[{_label(state.bought_up, up_price, 'UP')}]  "
-                f"DOWN={down_price:.4f}[{_label(state.bought_down, down_price, 'DOWN')}]  "
-                f"{src}"
-            )
+            # Range checks are evaluated once per tick and shared by the
+            # status labels and the buy logic below
+            in_up        = range_low   <= up_price   <= range_high
+            in_down      = range_low   <= down_price <= range_high
+            in_trig_up   = trigger_low <= up_price   <= trigger_high
+            in_trig_down = trigger_low <= down_price <= trigger_high
+
+            if log_ticks:
+                log.info(
+                    f"[{mins:02d}:{secs:02d}]  "
+                    f"UP={up_price:.4f}[{_label(state.bought_up, in_up, in_trig_up, 'UP')}]  "
+                    f"DOWN={down_price:.4f}[{_label(state.bought_down, in_down, in_trig_down, 'DOWN')}]  "
+                    f"{src}"
+                )
 
             # ══════════════════════════════════════════════════════════════
             #  BUY LOGIC
@@ -565,7 +704,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                 # Both sides independently watch PRICE_RANGE.
                 # Buy each side with AMOUNT_TO_BUY when it enters range.
                 # ─────────────────────────────────────────────────────────
-                if not state.bought_up and range_low <= up_price <= range_high:
+                if not state.bought_up and in_up:
                     shares, cost = _execute_buy(
                         executor, token_up, up_price, tick_up, "UP", AMOUNT_TO_BUY
                     )
@@ -576,7 +715,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                         state.up_cost    = cost
                         log.info(state.summary())
 
-                if not state.bought_down and range_low <= down_price <= range_high:
+                if not state.bought_down and in_down:
                     shares, cost = _execute_buy(
                         executor, token_down, down_price, tick_down, "DOWN", AMOUNT_TO_BUY
                     )
@@ -603,7 +742,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                 if state.trigger_side is None:
                     # ── Phase 1 ───────────────────────────────────────────
                     # Check UP first, then DOWN (arbitrary tiebreak)
-                    if not state.bought_up and trigger_low <= up_price <= trigger_high:
+                    if not state.bought_up and in_trig_up:
                         trig_amt = calc_trigger_amount(up_price)
                         log.info(
                             f"  [LP Phase 1] UP hit TRIGGER {trigger_low:.2f}–{trigger_high:.2f} "
@@ -625,7 +764,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                             )
                             log.info(state.summary())
 
-                    elif not state.bought_down and trigger_low <= down_price <= trigger_high:
+                    elif not state.bought_down and in_trig_down:
                         trig_amt = calc_trigger_amount(down_price)
                         log.info(
                             f"  [LP Phase 1] DOWN hit TRIGGER {trigger_low:.2f}–{trigger_high:.2f} "
@@ -649,7 +788,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
                 elif state.trigger_side == "UP":
                     # ── Phase 2: UP bought via trigger, wait for DOWN ──────
-                    if not state.bought_down and range_low <= down_price <= range_high:
+                    if not state.bought_down and in_down:
                         log.info(
                             f"  [LP Phase 2] DOWN hit PRICE_RANGE {range_low:.2f}–{range_high:.2f} "
                             f"@ {down_price:.4f}  →  amount=${AMOUNT_TO_BUY:.4f}"
@@ -666,7 +805,7 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
 
                 elif state.trigger_side == "DOWN":
                     # ── Phase 2: DOWN bought via trigger, wait for UP ──────
-                    if not state.bought_up and range_low <= up_price <= range_high:
+                    if not state.bought_up and in_up:
                         log.info(
                             f"  [LP Phase 2] UP hit PRICE_RANGE {range_low:.2f}–{range_high:.2f} "
                             f"@ {up_price:.4f}  →  amount=${AMOUNT_TO_BUY:.4f}"
@@ -681,9 +820,12 @@ def run_window(market: dict, executor: OrderExecutor, state: BotState):
                             state.up_cost    = cost
                             log.info(state.summary())
 
-            time.sleep(POLL_INTERVAL)
+            # Wake on the next WSS price update; POLL_INTERVAL caps the wait
+            # when the stream is quiet or down.
+            stream.wait_for_tick(POLL_INTERVAL, min_gap=1 / MAX_TICKS_PER_SEC)
 
     finally:
+        rest_stop.set()
         stream.stop()
         log.info("[WSS] Disconnected.")
 
@@ -1,8 +1,23 @@
-import hmac, hashlib, time, requests, json, os, logging
+import hmac, time, requests, json, os, logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
 
+# orjson varsa kullan — sort_keys ile json.dumps'un kompakt çıktısıyla birebir aynı
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Tek HTTP oturumu — pozisyon sorgusu ve relayer POST'u aynı keep-alive bağlantı havuzunu kullanır
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.1),
+))
+
 # Loglama Ayarları
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] >>> %(message)s')
 log = logging.getLogger("PolymarketFinal")
@@ -19,7 +34,7 @@ def run_documented_test():
 
     try:
         # 2. Cüzdan Pozisyonlarını Tara
-        r_pos = requests.get(f"https://data-api.polymarket.com/positions?user={pw}&limit=1", timeout=10)
+        r_pos = _SESSION.get(f"https://data-api.polymarket.com/positions?user={pw}&limit=1", timeout=10)
         pos_data = r_pos.json()
         if not pos_data:
             log.error("Cüzdanda çekilecek pozisyon bulunamadı!")
@@ -58,7 +73,10 @@ def run_documented_test():
             "type": "GNOSIS_SAFE"
         }
         
-        body_str = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+        if orjson is not None:
+            body_str = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS).decode()
+        else:
+            body_str = json.dumps(payload, separators=(',', ':'), sort_keys=True)
 
         # 6. HMAC L2 İmza (Hata burada düzeltildi)
         timestamp = str(int(time.time()))
@@ -66,8 +84,8 @@ def run_documented_test():
         path = "/submit"
         
         sig_message = f"{timestamp}{method}{path}{body_str}"
-        # .hexdigest() eklendi, sondaki hatalı nokta silindi
-        signature = hmac.new(s.encode(), sig_message.encode(), hashlib.sha256).hexdigest()
+        # hmac.digest: OpenSSL'in tek seferlik HMAC yolu (ara hmac nesnesi yok)
+        signature = hmac.digest(s.encode(), sig_message.encode(), "sha256").hex()
 
         # 7. Headerlar
         headers = {
@@ -80,7 +98,7 @@ def run_documented_test():
 
         # 8. Gönderim
         log.info("🚀 Relayer'a istek gönderiliyor...")
-        resp = requests.post("https://relayer-v2.polymarket.com/submit", data=body_str, headers=headers, timeout=20)
+        resp = _SESSION.post("https://relayer-v2.polymarket.com/submit", data=body_str, headers=headers, timeout=20)
 
         log.info(f"DURUM: {resp.status_code}")
         log.info(f"YANIT: {resp.text}")